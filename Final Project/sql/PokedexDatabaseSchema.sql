@@ -1,4 +1,10 @@
 -- DROP ALL TABLES
+-- DROP TABLE IF EXISTS SchemaVersion;
+-- DROP TABLE IF EXISTS LoadCheckpoint;
+-- DROP TABLE IF EXISTS PokemonProfile;
+-- DROP TABLE IF EXISTS TypeCount;
+-- DROP TABLE IF EXISTS WeaknessCount;
+-- DROP TABLE IF EXISTS PokemonSync;
 -- DROP TABLE IF EXISTS PokemonWeakness;
 -- DROP TABLE IF EXISTS PokemonType;
 -- DROP TABLE IF EXISTS Evolution;
@@ -75,4 +81,74 @@ CREATE TABLE Evolution (
     PRIMARY KEY (evolution_id),
     FOREIGN KEY (from_pokemon_id) REFERENCES Pokemon(pokemon_id),
     FOREIGN KEY (to_pokemon_id) REFERENCES Pokemon(pokemon_id)
-);
\ No newline at end of file
+);
+
+-- Content hash of each source record, used by the incremental sync mode of the loader
+CREATE TABLE PokemonSync (
+    num VARCHAR(5) NOT NULL,
+    content_hash CHAR(64) NOT NULL,
+    PRIMARY KEY (num)
+);
+
+-- Incremented by the loader after every load so the dashboard can invalidate its query cache
+CREATE TABLE LoadGeneration (
+    id INT NOT NULL,
+    generation INT NOT NULL,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id)
+);
+
+-- Progress of a chunked load (--chunk-size), written in the same transaction as each chunk so --resume can continue after the last committed one
+CREATE TABLE LoadCheckpoint (
+    id INT NOT NULL,
+    source_hash CHAR(64) NOT NULL,
+    phase VARCHAR(10) NOT NULL,
+    position INT NOT NULL,
+    last_num VARCHAR(5),
+    state MEDIUMTEXT NOT NULL,
+    saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id)
+);
+
+-- Summary tables rebuilt by the loader (refresh_summaries) so the dashboard reads them with point lookups
+CREATE TABLE TypeCount (
+    type_name VARCHAR(30) NOT NULL,
+    type_count INT NOT NULL,
+    PRIMARY KEY (type_name)
+);
+
+CREATE TABLE WeaknessCount (
+    weakness_name VARCHAR(30) NOT NULL,
+    weakness_count INT NOT NULL,
+    PRIMARY KEY (weakness_name)
+);
+
+CREATE TABLE PokemonProfile (
+    pokemon_id INT NOT NULL,
+    num VARCHAR(5),
+    name VARCHAR(50) NOT NULL,
+    img_url VARCHAR(255),
+    height_m DECIMAL(5,2),
+    weight_kg DECIMAL(5,2),
+    egg_distance_km DECIMAL(4,1),
+    evolution_cost INT NULL,
+    types VARCHAR(255),
+    weaknesses VARCHAR(255),
+    PRIMARY KEY (pokemon_id),
+    KEY idx_profile_name (name)
+);
+
+-- Migrations applied so far, one row per version (created and filled by migrate_db in the loader)
+CREATE TABLE SchemaVersion (
+    version INT NOT NULL,
+    description VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (version)
+);
+
+-- Migration 1: secondary indexes for the name-keyed dashboard queries (applied by migrate_db in the loader)
+CREATE UNIQUE INDEX idx_pokemon_num ON Pokemon (num);
+CREATE INDEX idx_pokemon_name ON Pokemon (name);
+CREATE INDEX idx_evolution_from ON Evolution (from_pokemon_id);
+CREATE INDEX idx_evolution_to ON Evolution (to_pokemon_id);
+INSERT INTO SchemaVersion (version, description) VALUES (1, 'Secondary indexes for the name-keyed dashboard queries');
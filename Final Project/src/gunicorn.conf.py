@@ -0,0 +1,15 @@
+import os
+import multiprocessing
+
+bind = os.environ.get("SERVER_BIND", "0.0.0.0:8050")
+workers = int(os.environ.get("SERVER_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("SERVER_THREADS", 4))
+timeout = int(os.environ.get("SERVER_TIMEOUT", 30))
+worker_class = "gthread" if threads > 1 else "sync"
+
+# Import wsgi.py once in the master and fork the workers from it.
+preload_app = True
+
+def post_fork(server, worker):
+    import wsgi
+    wsgi.dashboard.pokedex_fetcher.after_fork()
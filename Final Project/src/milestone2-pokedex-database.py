@@ -1,6 +1,21 @@
 import pymysql
+import pandas as pd
+import numpy as np
+import os
+import sys
 import json
 import re
+import time
+import argparse
+import hashlib
+import glob
+from itertools import chain, repeat
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+
+BATCH_SIZE = 500
+CHUNK_SIZE = 5000
+VALIDATE_BATCH_SIZE = 5000
 
 def get_connection():
     return pymysql.connect(
@@ -9,22 +24,23 @@ def get_connection():
         user="",
         password="",
         database=None,
-        autocommit=True
+        autocommit=False
     )
 
-def setup_db(cur):
+def setup_db(cur, drop=True):
     print("Setting up database...")
 
     cur.execute("CREATE DATABASE IF NOT EXISTS pokedex_db;")
     cur.execute("USE pokedex_db;")
 
-    tables = ["PokemonWeakness", "PokemonType", "Evolution", "Weakness", "Type", "Pokemon", "Candy", "Egg"]
+    tables = ["SchemaVersion", "LoadCheckpoint", "PokemonProfile", "TypeCount", "WeaknessCount", "PokemonSync", "PokemonWeakness", "PokemonType", "Evolution", "Weakness", "Type", "Pokemon", "Candy", "Egg"]
 
-    for table in tables:
-        cur.execute(f"DROP TABLE IF EXISTS {table};")
+    if drop:
+        for table in tables:
+            cur.execute(f"DROP TABLE IF EXISTS {table};")
 
     cur.execute("""
-        CREATE TABLE Candy (
+        CREATE TABLE IF NOT EXISTS Candy (
             candy_id INT AUTO_INCREMENT,
             name VARCHAR(50) NOT NULL,
             candy_count INT NULL,
@@ -33,7 +49,7 @@ def setup_db(cur):
     """)
 
     cur.execute("""
-        CREATE TABLE Egg (
+        CREATE TABLE IF NOT EXISTS Egg (
             egg_id INT AUTO_INCREMENT,
             distance_km DECIMAL(4,1) NOT NULL,
             PRIMARY KEY (egg_id)
@@ -41,7 +57,7 @@ def setup_db(cur):
     """)
 
     cur.execute("""
-        CREATE TABLE Pokemon (
+        CREATE TABLE IF NOT EXISTS Pokemon (
             pokemon_id INT AUTO_INCREMENT,
             num VARCHAR(5),
             name VARCHAR(50) NOT NULL,
@@ -60,7 +76,7 @@ def setup_db(cur):
     """)
 
     cur.execute("""
-        CREATE TABLE Type (
+        CREATE TABLE IF NOT EXISTS Type (
             type_id INT AUTO_INCREMENT,
             type_name VARCHAR(30) NOT NULL UNIQUE,
             PRIMARY KEY (type_id)
@@ -68,7 +84,7 @@ def setup_db(cur):
     """)
 
     cur.execute("""
-        CREATE TABLE PokemonType (
+        CREATE TABLE IF NOT EXISTS PokemonType (
             pokemon_id INT NOT NULL,
             type_id INT NOT NULL,
             PRIMARY KEY (pokemon_id, type_id),
@@ -78,7 +94,7 @@ def setup_db(cur):
     """)
 
     cur.execute("""
-        CREATE TABLE Weakness (
+        CREATE TABLE IF NOT EXISTS Weakness (
             weakness_id INT AUTO_INCREMENT,
             weakness_name VARCHAR(30) NOT NULL UNIQUE,
             PRIMARY KEY (weakness_id)
@@ -86,7 +102,7 @@ def setup_db(cur):
     """)
 
     cur.execute("""
-        CREATE TABLE PokemonWeakness (
+        CREATE TABLE IF NOT EXISTS PokemonWeakness (
             pokemon_id INT NOT NULL,
             weakness_id INT NOT NULL,
             PRIMARY KEY (pokemon_id, weakness_id),
@@ -96,7 +112,7 @@ def setup_db(cur):
     """)
 
     cur.execute("""
-        CREATE TABLE Evolution (
+        CREATE TABLE IF NOT EXISTS Evolution (
             evolution_id INT AUTO_INCREMENT,
             from_pokemon_id INT NOT NULL,
             to_pokemon_id INT NOT NULL,
@@ -107,17 +123,514 @@ def setup_db(cur):
         );
     """)
 
+    # Not in the drop list: the generation must keep increasing across full reloads so
+    # readers caching query results can tell that the data changed.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS LoadGeneration (
+            id INT NOT NULL,
+            generation INT NOT NULL,
+            loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id)
+        );
+    """)
+
+    # Progress of a chunked load, written in the same transaction as each chunk.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS LoadCheckpoint (
+            id INT NOT NULL,
+            source_hash CHAR(64) NOT NULL,
+            phase VARCHAR(10) NOT NULL,
+            position INT NOT NULL,
+            last_num VARCHAR(5),
+            state MEDIUMTEXT NOT NULL,
+            saved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id)
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS PokemonSync (
+            num VARCHAR(5) NOT NULL,
+            content_hash CHAR(64) NOT NULL,
+            PRIMARY KEY (num)
+        );
+    """)
+
+    # Summary tables derived from the tables above, maintained by refresh_summaries.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS TypeCount (
+            type_name VARCHAR(30) NOT NULL,
+            type_count INT NOT NULL,
+            PRIMARY KEY (type_name)
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS WeaknessCount (
+            weakness_name VARCHAR(30) NOT NULL,
+            weakness_count INT NOT NULL,
+            PRIMARY KEY (weakness_name)
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS PokemonProfile (
+            pokemon_id INT NOT NULL,
+            num VARCHAR(5),
+            name VARCHAR(50) NOT NULL,
+            img_url VARCHAR(255),
+            height_m DECIMAL(5,2),
+            weight_kg DECIMAL(5,2),
+            egg_distance_km DECIMAL(4,1),
+            evolution_cost INT NULL,
+            types VARCHAR(255),
+            weaknesses VARCHAR(255),
+            PRIMARY KEY (pokemon_id),
+            KEY idx_profile_name (name)
+        );
+    """)
+
     print("Database and tables created.")
 
+# Schema changes applied on top of setup_db. Each entry runs once and is recorded in
+# SchemaVersion, so new migrations are appended with the next version number.
+MIGRATIONS = [
+    (1, "Secondary indexes for the name-keyed dashboard queries", [
+        "CREATE UNIQUE INDEX idx_pokemon_num ON Pokemon (num)",
+        "CREATE INDEX idx_pokemon_name ON Pokemon (name)",
+        "CREATE INDEX idx_evolution_from ON Evolution (from_pokemon_id)",
+        "CREATE INDEX idx_evolution_to ON Evolution (to_pokemon_id)"
+    ])
+]
+
+def migrate_db(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaVersion (
+            version INT NOT NULL,
+            description VARCHAR(255) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (version)
+        );
+    """)
+
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM SchemaVersion")
+    current_version = cur.fetchone()[0]
+
+    for version, description, statements in MIGRATIONS:
+        if version <= current_version:
+            continue
+
+        for statement in statements:
+            cur.execute(statement)
+
+        cur.execute("INSERT INTO SchemaVersion (version, description) VALUES (%s, %s)", (version, description))
+        current_version = version
+        print(f"Applied migration {version}: {description}")
+
+    print(f"Schema is at version {current_version}.")
+    return current_version
+
+PROFILE_SELECT_SQL = """
+    SELECT
+        p.pokemon_id, p.num, p.name, p.img_url, p.height_m, p.weight_kg, egg.distance_km,
+        (SELECT e.cost FROM Evolution e WHERE e.from_pokemon_id = p.pokemon_id ORDER BY e.evolution_id LIMIT 1),
+        (SELECT GROUP_CONCAT(t.type_name ORDER BY t.type_id SEPARATOR ',')
+            FROM PokemonType pt JOIN Type t ON pt.type_id = t.type_id
+            WHERE pt.pokemon_id = p.pokemon_id),
+        (SELECT GROUP_CONCAT(w.weakness_name ORDER BY w.weakness_id SEPARATOR ',')
+            FROM PokemonWeakness pw JOIN Weakness w ON pw.weakness_id = w.weakness_id
+            WHERE pw.pokemon_id = p.pokemon_id)
+    FROM Pokemon p
+    LEFT JOIN Egg egg ON p.egg_id = egg.egg_id"""
+
+PROFILE_INSERT_SQL = """
+    INSERT INTO PokemonProfile (pokemon_id, num, name, img_url, height_m, weight_kg, egg_distance_km,
+                                evolution_cost, types, weaknesses)""" + PROFILE_SELECT_SQL
+
+def refresh_summaries(cur, pokemon_ids=None):
+    # Rebuilds the type/weakness counts (a handful of rows) and the PokemonProfile rows of
+    # the given Pokemon, or of every Pokemon when pokemon_ids is None. Ids that no longer
+    # exist in Pokemon simply lose their profile row.
+    start = time.perf_counter()
+
+    cur.execute("DELETE FROM TypeCount")
+    cur.execute("""
+        INSERT INTO TypeCount (type_name, type_count)
+        SELECT t.type_name, COUNT(pt.pokemon_id)
+        FROM Type t JOIN PokemonType pt ON t.type_id = pt.type_id
+        GROUP BY t.type_name""")
+
+    cur.execute("DELETE FROM WeaknessCount")
+    cur.execute("""
+        INSERT INTO WeaknessCount (weakness_name, weakness_count)
+        SELECT w.weakness_name, COUNT(pw.pokemon_id)
+        FROM Weakness w JOIN PokemonWeakness pw ON w.weakness_id = pw.weakness_id
+        GROUP BY w.weakness_name""")
+
+    if pokemon_ids is None:
+        cur.execute("DELETE FROM PokemonProfile")
+        cur.execute(PROFILE_INSERT_SQL)
+        refreshed = "all"
+    else:
+        pokemon_ids = sorted(pokemon_ids)
+        for i in range(0, len(pokemon_ids), BATCH_SIZE):
+            batch = pokemon_ids[i:i + BATCH_SIZE]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cur.execute(f"DELETE FROM PokemonProfile WHERE pokemon_id IN ({placeholders})", batch)
+            cur.execute(f"{PROFILE_INSERT_SQL} WHERE p.pokemon_id IN ({placeholders})", batch)
+        refreshed = len(pokemon_ids)
+
+    print(f"Summary tables refreshed ({refreshed} profiles) in {time.perf_counter() - start:.3f}s.")
+
+def bump_generation(cur):
+    cur.execute("""
+        INSERT INTO LoadGeneration (id, generation) VALUES (1, 1)
+        ON DUPLICATE KEY UPDATE generation = generation + 1, loaded_at = CURRENT_TIMESTAMP""")
+    cur.execute("SELECT generation FROM LoadGeneration WHERE id = 1")
+    generation = cur.fetchone()[0]
+    print(f"Load generation is now {generation}.")
+    return generation
+
 def parse_json(filename):
     f = open(filename, "r", encoding="utf-8")
     data = json.load(f)
     f.close()
     return data["pokemon"]
 
+def iter_pokemon(filename, chunk_size=65536):
+    # Yields the records of the "pokemon" array one at a time, so only the current
+    # record and one read chunk are held in memory.
+    decoder = json.JSONDecoder()
+    f = open(filename, "r", encoding="utf-8")
+    buf = ""
+    pos = None
+
+    while pos is None:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            f.close()
+            raise ValueError(f'No "pokemon" array found in {filename}')
+        buf += chunk
+        match = re.search(r'"pokemon"\s*:\s*\[', buf)
+        if match:
+            pos = match.end()
+        else:
+            buf = buf[-64:]
+
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+
+        if pos < len(buf) and buf[pos] == "]":
+            break
+
+        try:
+            record, end = decoder.raw_decode(buf, pos)
+        except ValueError:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                f.close()
+                raise ValueError(f"Truncated pokemon array in {filename}")
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+
+        yield record
+        buf = buf[end:]
+        pos = 0
+
+    f.close()
+
 def clean_name(name):
     return re.sub(r'\s*\(.*\)\s*|[♂♀]', '', name).strip()
 
+def egg_distance(p):
+    egg_str = p.get("egg", "Unknown")
+    if egg_str and "km" in egg_str:
+        return float(egg_str.split()[0])
+    return None
+
+def pokemon_fields(p):
+    height = float(p["height"].split()[0])
+    weight = float(p["weight"].split()[0])
+    return (p["num"], p["name"], p["img"], height, weight, p["spawn_chance"], p["avg_spawns"], p["spawn_time"])
+
+def normalize_pokemon(p):
+    # Flattens a source record to the values the loader writes, keyed by natural keys
+    # (candy name, egg distance, type and weakness names, evolution nums).
+    return {
+        "num": p["num"],
+        "fields": pokemon_fields(p),
+        "candy": p["candy"] if "candy" in p and p["candy"] else None,
+        "candy_count": p.get("candy_count"),
+        "egg": egg_distance(p),
+        "types": list(p["type"]),
+        "weaknesses": list(p["weaknesses"]),
+        "next_evolution": [evo["num"] for evo in p.get("next_evolution", [])]
+    }
+
+# Validation runs in front of every load, before setup_db drops anything. Each field has
+# one check that returns a reason or None; the patterns are compiled once and the limits
+# follow the column types in setup_db. record_errors applies them to one record, which the
+# process pool can do next to normalize_pokemon.
+NUM_PATTERN = re.compile(r"[0-9A-Za-z]{1,5}")
+UNITS = {"height": "m", "weight": "kg", "egg": "km"}
+UNIT_PATTERNS = {field: re.compile(r"\d+(?:\.\d+)? " + unit) for field, unit in UNITS.items()}
+SPAWN_TIME_PATTERN = re.compile(r"(?:[01]\d|2[0-3]):[0-5]\d|N/A")
+NUMBER_LIMITS = {"height": 999.99, "weight": 999.99, "egg": 999.9, "spawn_chance": 99.999, "avg_spawns": 999.99}
+TEXT_LIMITS = {"name": 50, "img": 255, "candy": 50, "type": 30, "weaknesses": 30}
+
+def num_error(field, value):
+    if not isinstance(value, str) or not NUM_PATTERN.fullmatch(value):
+        return f"num {value!r} is not 1-5 letters or digits"
+
+def text_error(field, value):
+    if not isinstance(value, str) or not value:
+        return f"{field} {value!r} is not a non-empty string"
+    if len(value) > TEXT_LIMITS[field]:
+        return f"{field} is longer than {TEXT_LIMITS[field]} characters"
+
+def candy_error(field, value):
+    # A missing or empty candy means the Pokemon has none.
+    if value:
+        return text_error(field, value)
+
+def candy_count_error(field, value):
+    if value is not None and (type(value) is not int or value < 0):
+        return f"candy_count {value!r} is not a non-negative integer"
+
+def unit_error(field, value):
+    if not isinstance(value, str) or not UNIT_PATTERNS[field].fullmatch(value):
+        return f"{field} {value!r} is not '<number> {UNITS[field]}'"
+    if float(value.split()[0]) > NUMBER_LIMITS[field]:
+        return f"{field} {value!r} is larger than {NUMBER_LIMITS[field]} {UNITS[field]}"
+
+def egg_error(field, value):
+    # Only values that mention km are distances; "Not in Eggs" and the like mean no egg.
+    if value is not None and not isinstance(value, str):
+        return f"egg {value!r} is not a string"
+    if value and "km" in value:
+        return unit_error(field, value)
+
+def number_error(field, value):
+    if type(value) not in (int, float) or not 0 <= value <= NUMBER_LIMITS[field]:
+        return f"{field} {value!r} is not a number between 0 and {NUMBER_LIMITS[field]}"
+
+def spawn_time_error(field, value):
+    if not isinstance(value, str) or not SPAWN_TIME_PATTERN.fullmatch(value):
+        return f"spawn_time {value!r} is not HH:MM or N/A"
+
+VALUE_CHECKS = {
+    "num": num_error, "name": text_error, "img": text_error, "candy": candy_error,
+    "candy_count": candy_count_error, "height": unit_error, "weight": unit_error, "egg": egg_error,
+    "spawn_chance": number_error, "avg_spawns": number_error, "spawn_time": spawn_time_error
+}
+
+def record_errors(p):
+    if not isinstance(p, dict):
+        return ["record is not an object"]
+
+    errors = [check(field, p.get(field)) for field, check in VALUE_CHECKS.items()]
+
+    for field in ("type", "weaknesses"):
+        names = p.get(field)
+        if not isinstance(names, list) or (field == "type" and not names):
+            errors.append(f"{field} {names!r} is not a list" + (" with at least one entry" if field == "type" else ""))
+        else:
+            errors.extend(text_error(field, name) for name in names)
+
+    for field in ("next_evolution", "prev_evolution"):
+        links = p.get(field, [])
+        if not isinstance(links, list) or not all(isinstance(evo, dict) and isinstance(evo.get("num"), str) for evo in links):
+            errors.append(f"{field} is not a list of objects with a num")
+
+    return [error for error in errors if error]
+
+# Fields that differ in nearly every record get a check over the whole column instead:
+# one regex pass over the joined nums, and string lengths through map.
+NUM_COLUMN_PATTERN = re.compile(r"(?:[0-9A-Za-z]{1,5}\n)*")
+
+def nums_are_clean(field, values):
+    return NUM_COLUMN_PATTERN.fullmatch("\n".join(values) + "\n") is not None
+
+def texts_are_clean(field, values):
+    lengths = list(map(len, values))
+    return set(map(type, values)) == {str} and min(lengths) > 0 and max(lengths) <= TEXT_LIMITS[field]
+
+COLUMN_CHECKS = {"num": nums_are_clean, "name": texts_are_clean, "img": texts_are_clean}
+
+def column(records, field, default=None):
+    return list(map(dict.get, records, repeat(field), repeat(default)))
+
+def batch_is_clean(records):
+    # Screens a whole batch for the common case where nothing is wrong: each check runs
+    # once per distinct value of a column, and the columns are gathered with C-level
+    # map/set instead of a Python loop per record. Any doubt sends the batch through
+    # record_errors, which stays the only source of reasons.
+    if set(map(type, records)) != {dict}:
+        return False
+    try:
+        for field, check in VALUE_CHECKS.items():
+            values = column(records, field)
+            if field in COLUMN_CHECKS:
+                if not COLUMN_CHECKS[field](field, values):
+                    return False
+            # Values are deduplicated together with their type: in a plain set True and 1.0
+            # collapse into 1 (and False into 0), so a bool would never reach the check.
+            elif any(check(field, value) for value_type, value in set(zip(map(type, values), values))):
+                return False
+
+        for field in ("type", "weaknesses"):
+            lists = column(records, field)
+            if set(map(type, lists)) != {list} or (field == "type" and not all(lists)):
+                return False
+            if any(text_error(field, name) for name in set(chain.from_iterable(lists))):
+                return False
+    except TypeError:
+        # An unhashable value where a string or number belongs.
+        return False
+
+    for field in ("next_evolution", "prev_evolution"):
+        # Missing keys come back as (), which the source JSON cannot contain, so an
+        # explicit null still fails the screen.
+        lists = column(records, field, ())
+        if not set(map(type, lists)) <= {list, tuple}:
+            return False
+        links = list(chain.from_iterable(lists))
+        if links and (set(map(type, links)) != {dict} or set(map(type, column(links, "num"))) != {str}):
+            return False
+
+    return True
+
+def iter_batches(records, batch_size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def evolution_links(records):
+    return [(p["num"], p["name"], [evo["num"] for evo in p["next_evolution"]]) for p in records if p.get("next_evolution")]
+
+class PokedexValidator:
+    # Passes good records on and writes bad ones to a JSON-lines dead-letter file with
+    # their reasons. The file is only created once there is something to write.
+    def __init__(self, dead_letter_path="dead-letter.jsonl"):
+        self.dead_letter_path = dead_letter_path
+        self.dead_letter = None
+        self.seen_nums = set()
+        self.rejected_nums = set()
+        self.rejected_positions = set()
+        self.position = 0
+        self.checked = 0
+        self.rejected = 0
+        self.dropped_edges = 0
+        self.seconds = 0.0
+
+    def write(self, entries):
+        if not entries:
+            return
+        if self.dead_letter is None:
+            self.dead_letter = open(self.dead_letter_path, "w", encoding="utf-8")
+        self.dead_letter.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+
+    def reject(self, rejects):
+        entries = []
+        for p, reasons in rejects:
+            num = p.get("num") if isinstance(p, dict) else None
+            if isinstance(num, str):
+                self.rejected_nums.add(num)
+            entries.append({"action": "rejected", "num": num, "name": p.get("name") if isinstance(p, dict) else None,
+                            "reasons": reasons, "record": p})
+        self.rejected += len(entries)
+        self.write(entries)
+
+    def filter(self, records):
+        # One batch of source records in, its good records out. A num that was already
+        # accepted is rejected, so the first record with it wins as in insert_data_parallel.
+        start = time.perf_counter()
+        if batch_is_clean(records):
+            nums = column(records, "num")
+            if len(set(nums)) == len(nums) and self.seen_nums.isdisjoint(nums):
+                self.seen_nums.update(nums)
+                self.position += len(records)
+                self.checked += len(records)
+                self.seconds += time.perf_counter() - start
+                return list(records)
+
+        good = []
+        rejects = []
+        for p in records:
+            reasons = record_errors(p)
+            if not reasons and p["num"] in self.seen_nums:
+                reasons = [f"duplicate num {p['num']}"]
+            if reasons:
+                rejects.append((p, reasons))
+                self.rejected_positions.add(self.position)
+            else:
+                self.seen_nums.add(p["num"])
+                good.append(p)
+            self.position += 1
+
+        self.reject(rejects)
+        self.checked += len(records)
+        self.seconds += time.perf_counter() - start
+        return good
+
+    def check_evolutions(self, links, known_nums):
+        # links are (num, name, next evolution nums). The loaders skip an edge whose
+        # target was not loaded; it is reported here instead of disappearing silently.
+        start = time.perf_counter()
+        links = list(links)
+        unknown = {target for target in chain.from_iterable(map(itemgetter(2), links)) if target not in known_nums}
+        if unknown:
+            entries = []
+            for num, name, targets in links:
+                missing = [target for target in targets if target in unknown]
+                if missing:
+                    entries.append({"action": "edge_dropped", "num": num, "name": name,
+                                    "reasons": [f"next_evolution {target} is not a loaded num" for target in missing]})
+                    self.dropped_edges += len(missing)
+            self.write(entries)
+        self.seconds += time.perf_counter() - start
+
+    def validate(self, pokemon_list):
+        # Batches keep one bad record from sending the whole input down the slow path.
+        good = [p for batch in iter_batches(pokemon_list, VALIDATE_BATCH_SIZE) for p in self.filter(batch)]
+        self.check_evolutions(evolution_links(good), self.seen_nums)
+        return good
+
+    def close(self):
+        if self.dead_letter is not None:
+            self.dead_letter.close()
+        print(f"Validated {self.checked} records in {self.seconds:.3f}s: {self.rejected} rejected, "
+              f"{self.dropped_edges} evolution links dropped"
+              + (f" (see {self.dead_letter_path})." if self.dead_letter is not None else "."))
+
+def normalize_file(filename):
+    # Runs in the process pool, so records are checked here too; bad ones come back with
+    # their reasons instead of being normalized. Good ones keep their source record, for
+    # the dead-letter entry when the writer finds their num already loaded. The time spent
+    # checking is returned for the validator's total.
+    records = []
+    rejects = []
+    check_seconds = 0.0
+    for p in parse_json(filename):
+        start = time.perf_counter()
+        reasons = record_errors(p)
+        check_seconds += time.perf_counter() - start
+        if reasons:
+            rejects.append((p, reasons))
+        else:
+            record = normalize_pokemon(p)
+            record["content_hash"] = record_hash(p)
+            record["source"] = p
+            records.append(record)
+    return records, rejects, check_seconds
+
 
 def insert_data(cur, pokemon_list):
     candy_map = {}
@@ -207,19 +720,709 @@ def insert_data(cur, pokemon_list):
                 WHERE from_pokemon_id = %s
             """, (cost, current_poke_id))
 
+    insert_batches(cur, INSERT_SQL["PokemonSync"], sync_rows(pokemon_list))
+
+
+# Bulk loader: ids are assigned client side (the tables were just recreated by setup_db,
+# so AUTO_INCREMENT starts at 1) and every table is written with executemany batches.
+# Full loads also record each source record's hash in PokemonSync, so the first --sync
+# after them only rewrites what actually changed.
+TABLE_LOAD_ORDER = ["Candy", "Egg", "Pokemon", "Type", "PokemonType", "Weakness", "PokemonWeakness", "Evolution"]
+LOAD_TABLES = TABLE_LOAD_ORDER + ["PokemonSync"]
+
+INSERT_SQL = {
+    "Candy": "INSERT INTO Candy (candy_id, name, candy_count) VALUES (%s, %s, %s)",
+    "Egg": "INSERT INTO Egg (egg_id, distance_km) VALUES (%s, %s)",
+    "Pokemon": """
+        INSERT INTO Pokemon (pokemon_id, num, name, img_url, height_m, weight_kg, spawn_chance, avg_spawns, spawn_time, candy_id, egg_id)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+    "Type": "INSERT INTO Type (type_id, type_name) VALUES (%s, %s)",
+    "PokemonType": "INSERT INTO PokemonType (pokemon_id, type_id) VALUES (%s, %s)",
+    "Weakness": "INSERT INTO Weakness (weakness_id, weakness_name) VALUES (%s, %s)",
+    "PokemonWeakness": "INSERT INTO PokemonWeakness (pokemon_id, weakness_id) VALUES (%s, %s)",
+    "Evolution": "INSERT INTO Evolution (evolution_id, from_pokemon_id, to_pokemon_id, cost) VALUES (%s, %s, %s, %s)",
+    "PokemonSync": """
+        INSERT INTO PokemonSync (num, content_hash) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE content_hash = VALUES(content_hash)"""
+}
+
+class PokedexRowBuilder:
+    def __init__(self):
+        self.candy_map = {}
+        self.egg_map = {}
+        self.type_map = {}
+        self.weak_map = {}
+        self.poke_map = {}
+        self.next_evolution_id = 1
+        self.rows = {table: [] for table in LOAD_TABLES}
+
+    def dimension_id(self, table, id_map, key, *values):
+        if key not in id_map:
+            id_map[key] = len(id_map) + 1
+            self.rows[table].append((id_map[key], key) + values)
+        return id_map[key]
+
+    def add_pokemon(self, record, content_hash=None):
+        candy_id = None
+        if record["candy"]:
+            candy_id = self.dimension_id("Candy", self.candy_map, record["candy"], record["candy_count"])
+
+        egg_id = None
+        if record["egg"] is not None:
+            egg_id = self.dimension_id("Egg", self.egg_map, record["egg"])
+
+        pokemon_id = len(self.poke_map) + 1
+        self.poke_map[record["num"]] = pokemon_id
+        self.rows["Pokemon"].append((pokemon_id,) + record["fields"] + (candy_id, egg_id))
+
+        for t in record["types"]:
+            self.rows["PokemonType"].append((pokemon_id, self.dimension_id("Type", self.type_map, t)))
+
+        for w in record["weaknesses"]:
+            self.rows["PokemonWeakness"].append((pokemon_id, self.dimension_id("Weakness", self.weak_map, w)))
+
+        if content_hash is not None:
+            self.rows["PokemonSync"].append((record["num"], content_hash))
+
+        return pokemon_id
+
+    def add_evolutions(self, record):
+        # The evolution cost is the candy_count of the source Pokemon, so it is written with
+        # the Evolution row instead of a follow-up UPDATE per Pokemon.
+        from_id = self.poke_map[record["num"]]
+        for to_num in record["next_evolution"]:
+            to_id = self.poke_map.get(to_num)
+            if to_id:
+                self.rows["Evolution"].append((self.next_evolution_id, from_id, to_id, record["candy_count"]))
+                self.next_evolution_id += 1
+
+    def take_rows(self):
+        rows = self.rows
+        self.rows = {table: [] for table in LOAD_TABLES}
+        return rows
+
+    def checkpoint_state(self):
+        # The dimension-key maps as JSON-friendly [key, id] pairs. poke_map is not part of
+        # it: it grows with every record and is read back from Pokemon on resume.
+        return {
+            "candy": list(self.candy_map.items()),
+            "egg": list(self.egg_map.items()),
+            "type": list(self.type_map.items()),
+            "weakness": list(self.weak_map.items()),
+            "next_evolution_id": self.next_evolution_id
+        }
+
+    def restore(self, state, poke_map):
+        self.candy_map = dict(state["candy"])
+        self.egg_map = dict(state["egg"])
+        self.type_map = dict(state["type"])
+        self.weak_map = dict(state["weakness"])
+        self.next_evolution_id = state["next_evolution_id"]
+        self.poke_map = dict(poke_map)
+
+def insert_batches(cur, sql, rows, batch_size=BATCH_SIZE):
+    for i in range(0, len(rows), batch_size):
+        cur.executemany(sql, rows[i:i + batch_size])
+    return len(rows)
+
+def load_rows(cur, rows, batch_size=BATCH_SIZE, stats=None):
+    if stats is None:
+        stats = {table: {"rows": 0, "seconds": 0.0} for table in LOAD_TABLES}
+
+    for table in LOAD_TABLES:
+        start = time.perf_counter()
+        stats[table]["rows"] += insert_batches(cur, INSERT_SQL[table], rows.get(table, []), batch_size)
+        stats[table]["seconds"] += time.perf_counter() - start
+
+    return stats
+
+def print_load_stats(stats):
+    total_rows = 0
+    total_seconds = 0.0
+    for table in LOAD_TABLES:
+        rows = stats[table]["rows"]
+        seconds = stats[table]["seconds"]
+        total_rows += rows
+        total_seconds += seconds
+        rate = rows / seconds if seconds > 0 else 0
+        print(f"  {table:<16} {rows:>7} rows  {seconds:8.3f}s  {rate:10.0f} rows/s")
+    print(f"  {'Total':<16} {total_rows:>7} rows  {total_seconds:8.3f}s")
+
+def build_rows(pokemon_list):
+    builder = PokedexRowBuilder()
+    records = [normalize_pokemon(p) for p in pokemon_list]
+
+    for record in records:
+        builder.add_pokemon(record)
+
+    for record in records:
+        builder.add_evolutions(record)
+
+    return builder.take_rows()
+
+# Vectorized normalization: the same tables as build_rows, computed a column at a time
+# with pandas instead of a record at a time. pd.factorize numbers keys in order of first
+# appearance, which is exactly how dimension_id assigns ids, so both produce identical
+# rows. Rows are only turned into tuples at the end, for the DB write.
+SOURCE_FIELDS = ["num", "name", "img", "type", "height", "weight", "candy", "candy_count", "egg",
+                 "spawn_chance", "avg_spawns", "spawn_time", "weaknesses", "next_evolution"]
+
+def parse_distinct(values, parse):
+    # Unit strings repeat heavily ("0.71 m", "2 km"), so each distinct value is parsed
+    # once and the results are spread back with the factorize codes. Missing values
+    # become NaN.
+    codes, distinct = pd.factorize(values)
+    parsed = np.array([parse(value) for value in distinct] + [np.nan], dtype="float64")
+    return pd.Series(parsed[codes], index=values.index)
+
+def leading_number(text):
+    return float(text.split()[0])
+
+def egg_km(text):
+    return float(text.split()[0]) if "km" in text else np.nan
+
+def factorize_ids(values):
+    # 1-based ids in order of first appearance; missing keys get <NA>.
+    codes, keys = pd.factorize(values)
+    ids = pd.Series(codes + 1, index=values.index, dtype="Int64")
+    ids[codes < 0] = pd.NA
+    return ids, keys
+
+def explode_ids(pokemon_ids, lists):
+    # One (pokemon_id, dimension_id) row per list element, in record order.
+    values = lists.explode().dropna()
+    ids, keys = factorize_ids(values)
+    links = pd.DataFrame({"pokemon_id": pokemon_ids.loc[values.index].to_numpy(), "id": ids.array})
+    return links, keys
+
+def normalize_frames(pokemon_list):
+    source = pd.DataFrame({field: [p.get(field) for p in pokemon_list] for field in SOURCE_FIELDS})
+    pokemon_ids = pd.Series(np.arange(1, len(source) + 1), index=source.index)
+    candy_count = source["candy_count"].astype("Float64").astype("Int64")
+
+    candy = source["candy"].where(source["candy"].notna() & (source["candy"] != ""))
+    candy_ids, candy_names = factorize_ids(candy)
+    first_candy = candy.notna() & ~candy.duplicated()
+
+    egg_ids, distances = factorize_ids(parse_distinct(source["egg"], egg_km))
+
+    type_links, type_names = explode_ids(pokemon_ids, source["type"])
+    weak_links, weak_names = explode_ids(pokemon_ids, source["weaknesses"])
+
+    # Evolution edges resolve nums against the last Pokemon with that num, like poke_map.
+    num_ids = pd.Series(pokemon_ids.to_numpy(), index=source["num"])
+    num_ids = num_ids[~num_ids.index.duplicated(keep="last")]
+    targets = source["next_evolution"].explode().dropna()
+    to_ids = pd.Series([evo["num"] for evo in targets], index=targets.index).map(num_ids)
+    edges = to_ids.notna()
+    from_ids = source["num"].loc[targets.index].map(num_ids)
+
+    return {
+        "Candy": pd.DataFrame({
+            "candy_id": candy_ids[first_candy].array,
+            "name": candy_names,
+            "candy_count": candy_count[first_candy].array
+        }),
+        "Egg": pd.DataFrame({"egg_id": np.arange(1, len(distances) + 1), "distance_km": distances}),
+        "Pokemon": pd.DataFrame({
+            "pokemon_id": pokemon_ids,
+            "num": source["num"],
+            "name": source["name"],
+            "img_url": source["img"],
+            "height_m": parse_distinct(source["height"], leading_number),
+            "weight_kg": parse_distinct(source["weight"], leading_number),
+            "spawn_chance": source["spawn_chance"],
+            "avg_spawns": source["avg_spawns"],
+            "spawn_time": source["spawn_time"],
+            "candy_id": candy_ids,
+            "egg_id": egg_ids
+        }),
+        "Type": pd.DataFrame({"type_id": np.arange(1, len(type_names) + 1), "type_name": type_names}),
+        "PokemonType": type_links.rename(columns={"id": "type_id"}),
+        "Weakness": pd.DataFrame({"weakness_id": np.arange(1, len(weak_names) + 1), "weakness_name": weak_names}),
+        "PokemonWeakness": weak_links.rename(columns={"id": "weakness_id"}),
+        "Evolution": pd.DataFrame({
+            "evolution_id": np.arange(1, edges.sum() + 1),
+            "from_pokemon_id": from_ids[edges].to_numpy(),
+            "to_pokemon_id": to_ids[edges].astype("int64").to_numpy(),
+            "cost": candy_count.loc[targets.index][edges].array
+        })
+    }
+
+def frame_rows(frames):
+    # DataFrames -> the row tuples load_rows expects, with Python scalars and None for
+    # missing values so the driver can write them.
+    rows = {}
+    for table in TABLE_LOAD_ORDER:
+        frame = frames[table]
+        columns = []
+        for name in frame.columns:
+            column = frame[name]
+            if column.hasnans:
+                column = column.astype(object).where(column.notna(), None)
+            columns.append(column.tolist())
+        rows[table] = list(zip(*columns))
+    return rows
+
+def insert_data_bulk(cur, pokemon_list, batch_size=BATCH_SIZE, vectorized=False):
+    start = time.perf_counter()
+    rows = frame_rows(normalize_frames(pokemon_list)) if vectorized else build_rows(pokemon_list)
+    rows["PokemonSync"] = sync_rows(pokemon_list)
+    print(f"Normalized {len(pokemon_list)} records in {time.perf_counter() - start:.3f}s "
+          f"({'vectorized' if vectorized else 'per record'}).")
+
+    stats = load_rows(cur, rows, batch_size)
+    print_load_stats(stats)
+    return stats
+
+# Chunked loads: every chunk of records is one transaction that also saves a checkpoint
+# in LoadCheckpoint (phase, records done, last num and the builder's dimension-key maps).
+# The checkpoint commits together with the rows it describes, so an interrupted load
+# resumes after the last committed chunk without repeating or skipping one.
+CHECKPOINT_UPSERT_SQL = """
+    INSERT INTO LoadCheckpoint (id, source_hash, phase, position, last_num, state) VALUES (1, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE source_hash = VALUES(source_hash), phase = VALUES(phase), position = VALUES(position),
+        last_num = VALUES(last_num), state = VALUES(state), saved_at = CURRENT_TIMESTAMP"""
+
+LOAD_PHASES = ["pokemon", "evolution"]
+
+def source_fingerprint(filenames):
+    # Identifies the input by path, size and modification time, so a checkpoint is never
+    # resumed against files that changed after it was written.
+    files = [(os.path.abspath(f), os.path.getsize(f), os.stat(f).st_mtime_ns) for f in filenames]
+    return hashlib.sha256(json.dumps(files).encode("utf-8")).hexdigest()
+
+def read_checkpoint(cur, source_hash):
+    cur.execute("SELECT source_hash, phase, position, last_num, state FROM LoadCheckpoint WHERE id = 1")
+    row = cur.fetchone()
+    if row is None or row[0] != source_hash:
+        return None
+    return {"phase": row[1], "position": row[2], "last_num": row[3], "state": json.loads(row[4])}
+
+def clear_checkpoint(cur):
+    cur.execute("DELETE FROM LoadCheckpoint")
+
+def insert_data_chunked(cur, pokemon_list, source_hash, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE, checkpoint=None):
+    start = time.perf_counter()
+    builder = PokedexRowBuilder()
+    records = [normalize_pokemon(p) for p in pokemon_list]
+    phase, position = LOAD_PHASES[0], 0
+
+    if checkpoint:
+        phase, position = checkpoint["phase"], checkpoint["position"]
+        if position and records[position - 1]["num"] != checkpoint["last_num"]:
+            raise ValueError(f"Checkpoint ends at num {checkpoint['last_num']}, but record {position} "
+                             f"of the input is {records[position - 1]['num']}.")
+        builder.restore(checkpoint["state"], fetch_id_map(cur, "SELECT num, pokemon_id FROM Pokemon"))
+        print(f"Resuming the {phase} phase after record {position} (num {checkpoint['last_num']}).")
+
+    stats = None
+    chunks = 0
+    commit_seconds = 0.0
+    for phase_name in LOAD_PHASES[LOAD_PHASES.index(phase):]:
+        first = position if phase_name == phase else 0
+
+        for offset in range(first, len(records), chunk_size):
+            chunk = records[offset:offset + chunk_size]
+            cur.execute("START TRANSACTION")
+            try:
+                if phase_name == "pokemon":
+                    for p, record in zip(pokemon_list[offset:offset + chunk_size], chunk):
+                        builder.add_pokemon(record, record_hash(p))
+                else:
+                    for record in chunk:
+                        builder.add_evolutions(record)
+                stats = load_rows(cur, builder.take_rows(), batch_size, stats)
+                cur.execute(CHECKPOINT_UPSERT_SQL, (source_hash, phase_name, offset + len(chunk), chunk[-1]["num"],
+                                                    json.dumps(builder.checkpoint_state())))
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+            commit_start = time.perf_counter()
+            cur.execute("COMMIT")
+            commit_seconds += time.perf_counter() - commit_start
+            chunks += 1
+
+    seconds = time.perf_counter() - start
+    if stats:
+        print_load_stats(stats)
+    print(f"Committed {chunks} chunks of up to {chunk_size} records in {seconds:.3f}s; "
+          f"COMMIT took {commit_seconds:.3f}s ({commit_seconds / seconds:.1%}).")
+    return {"tables": stats, "chunks": chunks, "chunk_size": chunk_size, "commit_seconds": commit_seconds, "seconds": seconds}
+
+# Column layout of the exported Arrow/Parquet tables: the same names and order as the
+# MySQL tables, so the files and the database can be read the same way.
+ARROW_COLUMNS = {
+    "Candy": [("candy_id", "int32"), ("name", "string"), ("candy_count", "int32")],
+    "Egg": [("egg_id", "int32"), ("distance_km", "float64")],
+    "Pokemon": [
+        ("pokemon_id", "int32"), ("num", "string"), ("name", "string"), ("img_url", "string"),
+        ("height_m", "float64"), ("weight_kg", "float64"), ("spawn_chance", "float64"),
+        ("avg_spawns", "float64"), ("spawn_time", "string"), ("candy_id", "int32"), ("egg_id", "int32")
+    ],
+    "Type": [("type_id", "int32"), ("type_name", "string")],
+    "PokemonType": [("pokemon_id", "int32"), ("type_id", "int32")],
+    "Weakness": [("weakness_id", "int32"), ("weakness_name", "string")],
+    "PokemonWeakness": [("pokemon_id", "int32"), ("weakness_id", "int32")],
+    "Evolution": [("evolution_id", "int32"), ("from_pokemon_id", "int32"), ("to_pokemon_id", "int32"), ("cost", "int32")]
+}
+
+ARROW_EXTENSIONS = {"arrow": ".arrow", "parquet": ".parquet"}
+
+def export_tables(pokemon_list, directory, file_format="arrow", vectorized=False):
+    # Writes the normalized tables as one file each, without a database. Arrow IPC files
+    # are uncompressed so readers can memory-map them; Parquet is smaller for analysts.
+    # manifest.json carries a generation that increases with every export, like
+    # LoadGeneration does for database loads.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    start = time.perf_counter()
+    if vectorized:
+        # The frames are already columnar and go to pyarrow without becoming tuples.
+        frames = normalize_frames(pokemon_list)
+        table_columns = {table: [frames[table][name] for name, kind in ARROW_COLUMNS[table]] for table in TABLE_LOAD_ORDER}
+    else:
+        rows = build_rows(pokemon_list)
+        table_columns = {table: list(zip(*rows[table])) if rows[table] else [()] * len(ARROW_COLUMNS[table])
+                         for table in TABLE_LOAD_ORDER}
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, "manifest.json")
+
+    generation = 0
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            generation = json.load(f).get("generation", 0)
+
+    counts = {}
+    for table in TABLE_LOAD_ORDER:
+        arrow_table = pa.table({
+            name: pa.array(column, type=pa.type_for_alias(kind), from_pandas=True)
+            for (name, kind), column in zip(ARROW_COLUMNS[table], table_columns[table])
+        })
+
+        # Each file is written under a temporary name and renamed over the old one. A replica
+        # that has the old file memory-mapped keeps reading it; truncating it in place
+        # would crash that reader with SIGBUS.
+        path = os.path.join(directory, table + ARROW_EXTENSIONS[file_format])
+        temp_path = path + ".tmp"
+        if file_format == "parquet":
+            pq.write_table(arrow_table, temp_path)
+        else:
+            with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
+        os.replace(temp_path, path)
+        counts[table] = arrow_table.num_rows
+
+    # Written last, so a reader that sees the new generation also sees the new files.
+    with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"generation": generation + 1, "format": file_format, "tables": counts}, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    print(f"Exported {sum(counts.values())} rows in {len(counts)} {file_format} files to {directory} "
+          f"in {time.perf_counter() - start:.3f}s (generation {generation + 1}).")
+    return counts
+
+def insert_data_streaming(cur, filename, batch_size=BATCH_SIZE, validator=None):
+    # First pass loads every table except Evolution in bounded batches. The builder only
+    # keeps the dimension maps and num -> pokemon_id, which the second pass uses to
+    # resolve evolution edges. With a validator, each batch is checked before it is
+    # normalized and the second pass skips the records the first pass rejected.
+    builder = PokedexRowBuilder()
+    stats = None
+
+    for batch in iter_batches(iter_pokemon(filename), batch_size):
+        if validator:
+            batch = validator.filter(batch)
+        for p in batch:
+            builder.add_pokemon(normalize_pokemon(p), record_hash(p))
+        stats = load_rows(cur, builder.take_rows(), batch_size, stats)
+
+    rejected = validator.rejected_positions if validator else set()
+    accepted = (p for position, p in enumerate(iter_pokemon(filename)) if position not in rejected)
+    for batch in iter_batches(accepted, batch_size):
+        if validator:
+            validator.check_evolutions(evolution_links(batch), builder.poke_map)
+        for p in batch:
+            builder.add_evolutions(normalize_pokemon(p))
+        stats = load_rows(cur, builder.take_rows(), batch_size, stats)
+
+    print_load_stats(stats)
+    return stats
+
+
+def record_hash(p):
+    return hashlib.sha256(json.dumps(p, sort_keys=True).encode("utf-8")).hexdigest()
+
+def sync_rows(pokemon_list):
+    return [(p["num"], record_hash(p)) for p in pokemon_list]
+
+def fetch_id_map(cur, sql):
+    cur.execute(sql)
+    return {row[0]: row[1] for row in cur.fetchall()}
+
+def get_or_create_id(cur, id_map, sql, key, *values):
+    if key not in id_map:
+        cur.execute(sql, (key,) + values)
+        id_map[key] = cur.lastrowid
+    return id_map[key]
+
+def sync_data(cur, pokemon_list, keep_nums=()):
+    # Incremental reload: only Pokemon whose source record hash changed are rewritten, and
+    # everything happens in one transaction so readers never see a half-applied sync.
+    # keep_nums are nums whose source record failed validation; their stored rows stay
+    # as they are instead of being deleted as missing.
+    start = time.perf_counter()
+    cur.execute("START TRANSACTION")
+
+    try:
+        stored_hashes = fetch_id_map(cur, "SELECT num, content_hash FROM PokemonSync")
+        poke_map = fetch_id_map(cur, "SELECT num, pokemon_id FROM Pokemon")
+        candy_map = fetch_id_map(cur, "SELECT name, candy_id FROM Candy")
+        egg_map = {float(k): v for k, v in fetch_id_map(cur, "SELECT distance_km, egg_id FROM Egg").items()}
+        type_map = fetch_id_map(cur, "SELECT type_name, type_id FROM Type")
+        weak_map = fetch_id_map(cur, "SELECT weakness_name, weakness_id FROM Weakness")
+
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        source_nums = set()
+        changed_hashes = []
+        touched_ids = set()
+        removed_edges = 0
+
+        for p in pokemon_list:
+            num = p["num"]
+            source_nums.add(num)
+            content_hash = record_hash(p)
+
+            if stored_hashes.get(num) == content_hash and num in poke_map:
+                counts["unchanged"] += 1
+                continue
+
+            candy_id = None
+            if "candy" in p and p["candy"]:
+                candy_id = get_or_create_id(cur, candy_map, "INSERT INTO Candy (name, candy_count) VALUES (%s, %s)",
+                                            p["candy"], p.get("candy_count"))
+
+            egg_id = None
+            distance = egg_distance(p)
+            if distance is not None:
+                egg_id = get_or_create_id(cur, egg_map, "INSERT INTO Egg (distance_km) VALUES (%s)", distance)
+
+            if num in poke_map:
+                pokemon_id = poke_map[num]
+                cur.execute("""
+                    UPDATE Pokemon
+                    SET num = %s, name = %s, img_url = %s, height_m = %s, weight_kg = %s, spawn_chance = %s,
+                        avg_spawns = %s, spawn_time = %s, candy_id = %s, egg_id = %s
+                    WHERE pokemon_id = %s """, pokemon_fields(p) + (candy_id, egg_id, pokemon_id))
+                cur.execute("DELETE FROM PokemonType WHERE pokemon_id = %s", (pokemon_id,))
+                cur.execute("DELETE FROM PokemonWeakness WHERE pokemon_id = %s", (pokemon_id,))
+                counts["updated"] += 1
+            else:
+                cur.execute("""
+                    INSERT INTO Pokemon (num, name, img_url, height_m, weight_kg, spawn_chance, avg_spawns, spawn_time, candy_id, egg_id)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) """, pokemon_fields(p) + (candy_id, egg_id))
+                pokemon_id = cur.lastrowid
+                poke_map[num] = pokemon_id
+                counts["inserted"] += 1
+
+            type_rows = [(pokemon_id, get_or_create_id(cur, type_map, "INSERT INTO Type (type_name) VALUES (%s)", t))
+                         for t in p["type"]]
+            weak_rows = [(pokemon_id, get_or_create_id(cur, weak_map, "INSERT INTO Weakness (weakness_name) VALUES (%s)", w))
+                         for w in p["weaknesses"]]
+            insert_batches(cur, "INSERT INTO PokemonType (pokemon_id, type_id) VALUES (%s, %s)", type_rows)
+            insert_batches(cur, "INSERT INTO PokemonWeakness (pokemon_id, weakness_id) VALUES (%s, %s)", weak_rows)
+            changed_hashes.append((num, content_hash))
+            touched_ids.add(pokemon_id)
+
+        for num in [n for n in poke_map if n not in source_nums and n not in keep_nums]:
+            pokemon_id = poke_map.pop(num)
+            touched_ids.add(pokemon_id)
+            # The deleted Pokemon's edges in both directions go with it and count as removed.
+            cur.execute("SELECT from_pokemon_id FROM Evolution WHERE from_pokemon_id = %s OR to_pokemon_id = %s",
+                        (pokemon_id, pokemon_id))
+            edge_sources = [row[0] for row in cur.fetchall()]
+            touched_ids.update(edge_sources)
+            removed_edges += len(edge_sources)
+            cur.execute("DELETE FROM Evolution WHERE from_pokemon_id = %s OR to_pokemon_id = %s", (pokemon_id, pokemon_id))
+            cur.execute("DELETE FROM PokemonType WHERE pokemon_id = %s", (pokemon_id,))
+            cur.execute("DELETE FROM PokemonWeakness WHERE pokemon_id = %s", (pokemon_id,))
+            cur.execute("DELETE FROM Pokemon WHERE pokemon_id = %s", (pokemon_id,))
+            cur.execute("DELETE FROM PokemonSync WHERE num = %s", (num,))
+            counts["deleted"] += 1
+
+        # Evolution edges can change without their source record changing (a target may
+        # have just been added), so the edge set is diffed as a whole. Edges leaving a kept
+        # Pokemon have no source record to diff against and stay as stored.
+        kept_ids = {poke_map[num] for num in keep_nums if num in poke_map and num not in source_nums}
+        wanted_edges = {}
+        for p in pokemon_list:
+            for evo in p.get("next_evolution", []):
+                if evo["num"] in poke_map:
+                    wanted_edges[(poke_map[p["num"]], poke_map[evo["num"]])] = p.get("candy_count")
+
+        cur.execute("SELECT evolution_id, from_pokemon_id, to_pokemon_id, cost FROM Evolution")
+        existing_edges = {}
+        stale_edges = []
+        for evolution_id, from_id, to_id, cost in cur.fetchall():
+            key = (from_id, to_id)
+            if from_id in kept_ids:
+                continue
+            if key in wanted_edges and key not in existing_edges and wanted_edges[key] == cost:
+                existing_edges[key] = evolution_id
+            else:
+                stale_edges.append((evolution_id,))
+                touched_ids.add(from_id)
+
+        new_edges = [key + (cost,) for key, cost in wanted_edges.items() if key not in existing_edges]
+        touched_ids.update(from_id for from_id, to_id, cost in new_edges)
+        insert_batches(cur, "DELETE FROM Evolution WHERE evolution_id = %s", stale_edges)
+        removed_edges += len(stale_edges)
+        insert_batches(cur, "INSERT INTO Evolution (from_pokemon_id, to_pokemon_id, cost) VALUES (%s, %s, %s)", new_edges)
+
+        insert_batches(cur, INSERT_SQL["PokemonSync"], changed_hashes)
+
+        refresh_summaries(cur, touched_ids)
+
+        cur.execute("COMMIT")
+    except Exception:
+        cur.execute("ROLLBACK")
+        raise
+
+    seconds = time.perf_counter() - start
+    print(f"Sync complete in {seconds:.3f}s: {counts['inserted']} inserted, {counts['updated']} updated, "
+          f"{counts['deleted']} deleted, {counts['unchanged']} unchanged, "
+          f"evolutions +{len(new_edges)} -{removed_edges}")
+    counts["evolutions_added"] = len(new_edges)
+    counts["evolutions_removed"] = removed_edges
+    counts["seconds"] = seconds
+    return counts
+
+def expand_paths(patterns):
+    filenames = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        filenames.extend(matches if matches else [pattern])
+    return filenames
+
+def insert_data_parallel(cur, filenames, workers=None, batch_size=BATCH_SIZE, validator=None):
+    # Files are parsed, checked and normalized in a process pool; this process is the single
+    # writer, so Candy/Egg/Type/Weakness are deduplicated globally by the builder's key maps.
+    # When a num appears in more than one file, the first file in argument order wins.
+    builder = PokedexRowBuilder()
+    kept = []
+    skipped = 0
+    stats = None
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for filename, (records, rejects, check_seconds) in zip(filenames, pool.map(normalize_file, filenames)):
+            print(f"  {filename}: {len(records)} records, {len(rejects)} rejected")
+            duplicates = []
+            for record in records:
+                if record["num"] in builder.poke_map:
+                    duplicates.append((record["source"], [f"duplicate num {record['num']}"]))
+                    skipped += 1
+                    continue
+                builder.add_pokemon(record, record["content_hash"])
+                kept.append(record)
+                if len(builder.rows["Pokemon"]) >= batch_size:
+                    stats = load_rows(cur, builder.take_rows(), batch_size, stats)
+
+            if validator:
+                start_reject = time.perf_counter()
+                validator.checked += len(records) + len(rejects)
+                validator.reject(rejects + duplicates)
+                validator.seconds += check_seconds + time.perf_counter() - start_reject
+
+    if validator:
+        validator.check_evolutions(((r["num"], r["fields"][1], r["next_evolution"]) for r in kept), builder.poke_map)
+    for record in kept:
+        builder.add_evolutions(record)
+    stats = load_rows(cur, builder.take_rows(), batch_size, stats)
+
+    print_load_stats(stats)
+    print(f"Loaded {len(kept)} Pokemon from {len(filenames)} files in {time.perf_counter() - start:.3f}s "
+          f"({skipped} duplicate nums skipped)")
+    return stats
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create pokedex_db and load it from Pokedex JSON files.")
+    parser.add_argument("files", nargs="*", default=["pokedex.json"], help="JSON files or glob patterns")
+    parser.add_argument("--workers", type=int, default=None, help="processes used to parse multiple files")
+    parser.add_argument("--bulk", action="store_true", help="load with client-side ids and batched multi-row inserts")
+    parser.add_argument("--stream", action="store_true", help="parse the file incrementally and load it in batches")
+    parser.add_argument("--sync", action="store_true", help="apply only changed records instead of dropping and reloading")
+    parser.add_argument("--vectorized", action="store_true", help="normalize with pandas for --bulk and --export")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--export", metavar="DIR", help="write the normalized tables to DIR instead of loading the database")
+    parser.add_argument("--format", choices=sorted(ARROW_EXTENSIONS), default="arrow", help="file format for --export")
+    parser.add_argument("--dead-letter", default="dead-letter.jsonl", help="JSON-lines file for records that fail validation")
+    parser.add_argument("--chunk-size", type=int, help="commit every this many records and checkpoint the progress")
+    parser.add_argument("--resume", action="store_true", help="continue an interrupted --chunk-size load from its checkpoint")
+    args = parser.parse_args()
+    chunked = args.chunk_size or args.resume
+    if chunked and (args.sync or args.stream or args.workers or args.vectorized or args.export):
+        parser.error("--chunk-size and --resume cannot be combined with --sync, --stream, --workers, --vectorized or --export")
+    filenames = expand_paths(args.files)
+    validator = PokedexValidator(args.dead_letter)
+    in_flight = not (args.sync or args.export or chunked) and (len(filenames) > 1 or args.workers or args.stream)
+
+    # Whole-file loads are validated before setup_db drops anything; --stream and the
+    # process pool check each batch as it arrives instead.
+    pokemon_list = None
+    if not in_flight:
+        pokemon_list = validator.validate([p for filename in filenames for p in parse_json(filename)])
+        if not pokemon_list:
+            validator.close()
+            print("No valid records to load; nothing was changed.")
+            sys.exit(1)
+
+    if args.export:
+        export_tables(pokemon_list, args.export, args.format, args.vectorized)
+        validator.close()
+        sys.exit(0)
+
     cnx = get_connection()
     cur = cnx.cursor()
 
     print("Connected to AWS instance.")
-    setup_db(cur)
+    checkpoint = None
+    if args.resume:
+        setup_db(cur, drop=False)
+        migrate_db(cur)
+        checkpoint = read_checkpoint(cur, source_fingerprint(filenames))
+        if checkpoint is None:
+            print("No checkpoint for this input; starting a fresh load.")
+
+    if checkpoint is None:
+        setup_db(cur, drop=not args.sync)
+        migrate_db(cur)
 
     print("Parsing and inserting data into database...")
-    data = parse_json("pokedex.json")
-    insert_data(cur, data)
+    if chunked:
+        insert_data_chunked(cur, pokemon_list, source_fingerprint(filenames), args.chunk_size or CHUNK_SIZE,
+                            args.batch_size, checkpoint)
+    elif args.sync:
+        sync_data(cur, pokemon_list, validator.rejected_nums)
+    elif len(filenames) > 1 or args.workers:
+        insert_data_parallel(cur, filenames, args.workers, args.batch_size, validator)
+    elif args.stream:
+        insert_data_streaming(cur, filenames[0], args.batch_size, validator)
+    elif args.bulk or args.vectorized:
+        insert_data_bulk(cur, pokemon_list, args.batch_size, args.vectorized)
+    else:
+        insert_data(cur, pokemon_list)
+    validator.close()
 
+    if not args.sync:
+        refresh_summaries(cur)
+    bump_generation(cur)
+    if chunked:
+        clear_checkpoint(cur)
     cnx.commit()
     cur.close()
     cnx.close()
-    print("Connection closed.")
\ No newline at end of file
+    print("Connection closed.")
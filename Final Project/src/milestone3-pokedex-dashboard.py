@@ -1,54 +1,1241 @@
 import pandas as pd
+import numpy as np
 from sqlalchemy import create_engine, text
-from dash import Dash, dcc, html, Input, Output
-import plotly.express as px
+from sqlalchemy.exc import ProgrammingError, TimeoutError as SQLAlchemyTimeoutError
+from dash import Dash, dcc, html, Input, Output, State
+from dash.exceptions import PreventUpdate
+from flask import Response, jsonify
 import plotly.graph_objects as go
+from plotly.io.json import to_json_plotly
 import os 
 import sys 
-from collections import deque 
+import time
+import re
+import json
+import bisect
+import threading
+import contextvars
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+from collections import deque, Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 DB_HOST = ""
 DB_USER = ""
 DB_PASS = "" 
 DB_NAME = "pokedex_db"
 
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "1") == "1"
+DB_RECONNECT_BACKOFF = float(os.environ.get("DB_RECONNECT_BACKOFF", 1))
+DB_RECONNECT_MAX_BACKOFF = float(os.environ.get("DB_RECONNECT_MAX_BACKOFF", 60))
+
+CACHE_SIZE = int(os.environ.get("CACHE_SIZE", 512))
+CACHE_TTL = float(os.environ.get("CACHE_TTL", 300))
+GENERATION_CHECK_INTERVAL = float(os.environ.get("GENERATION_CHECK_INTERVAL", 5))
+SNAPSHOT_MODE = os.environ.get("SNAPSHOT_MODE", "0") == "1"
+SNAPSHOT_REFRESH_INTERVAL = float(os.environ.get("SNAPSHOT_REFRESH_INTERVAL", 30))
+ARROW_DIR = os.environ.get("ARROW_DIR")
+CONCURRENT_QUERIES = os.environ.get("CONCURRENT_QUERIES", "1") == "1"
+QUERY_WORKERS = int(os.environ.get("QUERY_WORKERS", 4))
+FIGURE_CACHE_SIZE = int(os.environ.get("FIGURE_CACHE_SIZE", 2048))
+PRERENDER_FIGURES = os.environ.get("PRERENDER_FIGURES", "0") == "1"
+CLIENTSIDE_HIGHLIGHT = os.environ.get("CLIENTSIDE_HIGHLIGHT", "0") == "1"
+IMPORT_TIME_BUDGET = float(os.environ.get("IMPORT_TIME_BUDGET", 3))
+SEARCH_RESULTS = int(os.environ.get("SEARCH_RESULTS", 20))
+SEARCH_DEBOUNCE_MS = int(os.environ.get("SEARCH_DEBOUNCE_MS", 150))
+MATCHUP_RESULTS = int(os.environ.get("MATCHUP_RESULTS", 5))
+TEAM_SIZE = int(os.environ.get("TEAM_SIZE", 6))
+SLOW_QUERY_SECONDS = float(os.environ.get("SLOW_QUERY_SECONDS", 0.5))
+QUERY_METRICS_WINDOW = int(os.environ.get("QUERY_METRICS_WINDOW", 1000))
+TRACING = os.environ.get("TRACING", "0") == "1"
+TRACE_WINDOW = int(os.environ.get("TRACE_WINDOW", 200))
+
+SQL_ALL_NAMES = "SELECT name, num FROM Pokemon ORDER BY pokemon_id"
+
+# ER_PARSE_ERROR, the only error that shows the server cannot run a query at all. Others,
+# such as ER_NO_SUCH_TABLE (1146) while a reload has the tables dropped, pass.
+MYSQL_SYNTAX_ERROR = 1064
+
+SQL_GENERATION = "SELECT generation FROM LoadGeneration WHERE id = 1"
+
+SQL_PREV_EVOLUTION = """
+    SELECT prev_poke.name AS prev_evolution_name
+    FROM Pokemon current_poke
+    JOIN Evolution e ON current_poke.pokemon_id = e.to_pokemon_id
+    JOIN Pokemon prev_poke ON e.from_pokemon_id = prev_poke.pokemon_id
+    WHERE current_poke.name = :p_name
+"""
+
+SQL_NEXT_EVOLUTION = """
+    SELECT next_poke.name AS next_evolution_name
+    FROM Pokemon current_poke
+    JOIN Evolution e ON current_poke.pokemon_id = e.from_pokemon_id
+    JOIN Pokemon next_poke ON e.to_pokemon_id = next_poke.pokemon_id
+    WHERE current_poke.name = :p_name
+"""
+
+SQL_TYPE_COUNTS = """
+    SELECT 
+        t.type_name,
+        COUNT(pt.pokemon_id) AS type_count
+    FROM Type t 
+    JOIN PokemonType pt ON t.type_id = pt.type_id
+    GROUP BY t.type_name
+    ORDER BY type_count DESC
+"""
+
+# Full profile in one round trip: type and weakness lists, the evolution cost and the
+# global type distribution are folded in as GROUP_CONCAT subqueries.
+SQL_PROFILE = """
+    SELECT 
+        p.pokemon_id, p.num, p.name, 
+        COALESCE(p.height_m, 'N/A') AS height_m, 
+        COALESCE(p.weight_kg, 'N/A') AS weight_kg, 
+        COALESCE(egg.distance_km, 'N/A') AS egg_distance_km, 
+        COALESCE(p.img_url, 'https://via.placeholder.com/200?text=No+Image') AS img_url,
+        (SELECT GROUP_CONCAT(t.type_name ORDER BY t.type_id SEPARATOR ',')
+            FROM PokemonType pt JOIN Type t ON pt.type_id = t.type_id
+            WHERE pt.pokemon_id = p.pokemon_id) AS types,
+        (SELECT GROUP_CONCAT(w.weakness_name ORDER BY w.weakness_id SEPARATOR ',')
+            FROM PokemonWeakness pw JOIN Weakness w ON pw.weakness_id = w.weakness_id
+            WHERE pw.pokemon_id = p.pokemon_id) AS weaknesses,
+        COALESCE((SELECT e.cost FROM Evolution e WHERE e.from_pokemon_id = p.pokemon_id LIMIT 1), 'N/A') AS evolution_cost,
+        (SELECT GROUP_CONCAT(CONCAT(tc.type_name, ':', tc.type_count) ORDER BY tc.type_count DESC SEPARATOR ',')
+            FROM (
+                SELECT tc_t.type_name, COUNT(tc_pt.pokemon_id) AS type_count
+                FROM Type tc_t JOIN PokemonType tc_pt ON tc_t.type_id = tc_pt.type_id
+                GROUP BY tc_t.type_name
+            ) tc) AS type_counts
+    FROM Pokemon p 
+    LEFT JOIN Egg egg ON p.egg_id = egg.egg_id
+    WHERE p.name = :p_name
+"""
+
+# Point lookups against the summary tables the loader maintains (refresh_summaries).
+SQL_PROFILE_TABLE = """
+    SELECT 
+        pokemon_id, num, name, 
+        COALESCE(height_m, 'N/A') AS height_m, 
+        COALESCE(weight_kg, 'N/A') AS weight_kg, 
+        COALESCE(egg_distance_km, 'N/A') AS egg_distance_km, 
+        COALESCE(img_url, 'https://via.placeholder.com/200?text=No+Image') AS img_url,
+        types, weaknesses,
+        COALESCE(evolution_cost, 'N/A') AS evolution_cost
+    FROM PokemonProfile
+    WHERE name = :p_name
+"""
+
+SQL_TYPE_COUNT_TABLE = "SELECT type_name, type_count FROM TypeCount ORDER BY type_count DESC"
+
+SQL_WEAKNESS_MAP = """
+    SELECT p.name, w.weakness_name
+    FROM Pokemon p
+    JOIN PokemonWeakness pw ON p.pokemon_id = pw.pokemon_id
+    JOIN Weakness w ON pw.weakness_id = w.weakness_id
+    ORDER BY p.pokemon_id, w.weakness_id
+"""
+
+SQL_TYPE_MAP = """
+    SELECT p.name, t.type_name
+    FROM Pokemon p
+    JOIN PokemonType pt ON p.pokemon_id = pt.pokemon_id
+    JOIN Type t ON pt.type_id = t.type_id
+    ORDER BY p.pokemon_id, t.type_id
+"""
+
+SQL_SUMMARY = """
+    SELECT p.name, p.num, COALESCE(p.img_url, 'https://via.placeholder.com/200?text=No+Image') AS img_url
+    FROM Pokemon p
+    WHERE p.name = :p_name
+"""
+
+# Whole evolution family in one query: climb Evolution to the root of the selected
+# Pokemon, then walk every descendant of that root. Depth is capped so bad data with a
+# cycle cannot recurse forever, and nodes are ordered like the breadth-first walk.
+SQL_EVOLUTION_FAMILY = """
+    WITH RECURSIVE ancestors (pokemon_id, depth) AS (
+        SELECT pokemon_id, 0 FROM Pokemon WHERE name = :p_name
+        UNION ALL
+        SELECT e.from_pokemon_id, a.depth + 1
+        FROM ancestors a JOIN Evolution e ON e.to_pokemon_id = a.pokemon_id
+        WHERE a.depth < 20
+    ),
+    root AS (
+        SELECT pokemon_id FROM ancestors ORDER BY depth DESC, pokemon_id LIMIT 1
+    ),
+    family (pokemon_id, depth) AS (
+        SELECT pokemon_id, 0 FROM root
+        UNION ALL
+        SELECT e.to_pokemon_id, f.depth + 1
+        FROM family f JOIN Evolution e ON e.from_pokemon_id = f.pokemon_id
+        WHERE f.depth < 20
+    )
+    SELECT p.name, p.num, COALESCE(p.img_url, 'https://via.placeholder.com/200?text=No+Image') AS img_url,
+           MIN(f.depth) AS depth
+    FROM family f JOIN Pokemon p ON p.pokemon_id = f.pokemon_id
+    GROUP BY p.pokemon_id, p.name, p.num, p.img_url
+    ORDER BY depth, p.pokemon_id
+"""
+
+# Queries the dashboard runs per selection, checked by check_query_plans, with the table
+# aliases allowed to be read by a full scan. The listing, the global type distribution and
+# the type and weakness maps read whole tables by design ('<derived>' covers derived tables).
+DASHBOARD_QUERIES = {
+    "all_names": (SQL_ALL_NAMES, {'Pokemon'}),
+    "prev_evolution": (SQL_PREV_EVOLUTION, set()),
+    "next_evolution": (SQL_NEXT_EVOLUTION, set()),
+    "profile": (SQL_PROFILE, {'tc_t', 'tc_pt', '<derived>'}),
+    "summary": (SQL_SUMMARY, set()),
+    "profile_table": (SQL_PROFILE_TABLE, set()),
+    "type_count_table": (SQL_TYPE_COUNT_TABLE, {'TypeCount'}),
+    "evolution_family": (SQL_EVOLUTION_FAMILY, {'ancestors', 'root', 'family', 'a', 'f', '<derived>'}),
+    "type_counts": (SQL_TYPE_COUNTS, {'t', 'pt'}),
+    "weakness_map": (SQL_WEAKNESS_MAP, {'p', 'pw', 'w'}),
+    "type_map": (SQL_TYPE_MAP, {'p', 'pt', 't'})
+}
+
+QUERY_LABELS = {sql: label for label, (sql, allowed_scans) in DASHBOARD_QUERIES.items()}
+
+# Labels of the queries sent to the database during the current callback (see
+# count_queries). Worker threads of the query pool get the same list through a copied
+# context.
+callback_queries = contextvars.ContextVar('callback_queries', default=None)
+
+def read_generation(conn):
+    df = pd.read_sql(text(SQL_GENERATION), conn)
+    return int(df.iloc[0]['generation']) if not df.empty else None
+
+def read_arrow_generation(directory):
+    with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+        return json.load(f).get("generation")
+
+def read_arrow_table(directory, table):
+    # Tables exported by the loader (--export). Arrow IPC files are memory-mapped, which
+    # skips one read into a buffer; to_pandas and the snapshot's merges still copy the
+    # data. The loader replaces files instead of rewriting them, so a mapping stays valid.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = os.path.join(directory, table + ".arrow")
+    if os.path.exists(path):
+        return pa.ipc.open_file(pa.memory_map(path)).read_all().to_pandas()
+    return pq.read_table(os.path.join(directory, table + ".parquet"), memory_map=True).to_pandas()
+
+def is_programming_error(e):
+    # pandas re-raises SQLAlchemy errors from read_sql as its own DatabaseError.
+    return isinstance(e, ProgrammingError) or isinstance(e.__cause__, ProgrammingError)
+
+def mysql_error_code(e):
+    # The MySQL error number of a failed query, which pymysql passes as the first argument
+    # of the driver exception; None for other errors.
+    error = e if isinstance(e, ProgrammingError) else e.__cause__
+    args = getattr(getattr(error, 'orig', None), 'args', ())
+    return args[0] if args and isinstance(args[0], int) else None
+
+def split_list(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)) or value == '':
+        return []
+    return str(value).split(',')
+
+def search_words(text):
+    # Lowercase words of a name or a query, with the gender symbols spelled out and
+    # punctuation dropped: "Nidoran ♀ (Female)" -> ['nidoran', 'female'].
+    text = str(text).lower().replace('♂', ' male ').replace('♀', ' female ')
+    return list(dict.fromkeys(re.sub(r"[^\w\s]", "", text).split()))
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class PokemonSearchIndex:
+    # In-memory name search for the dropdown. Every query word must be a prefix of a word
+    # of the name (or of the Pokedex number), so "nidoran f", "mr mime" and "#25" all
+    # match. When that finds nothing, a trigram index over the names without spaces
+    # supplies substring and typo matches ("chu", "pikchu").
+    TRIGRAM_MIN_SCORE = 0.5
+
+    def __init__(self, catalog):
+        self.names = [name for name, num in catalog]
+        self.nums = [str(num) for name, num in catalog]
+        self.words = [search_words(name) for name in self.names]
+
+        # (word, position) pairs sorted by word; all words starting with a prefix are one
+        # contiguous range found by bisection.
+        self.prefixes = sorted(
+            (word, pos) for pos, words in enumerate(self.words) for word in words
+        )
+        self.prefix_words = [word for word, pos in self.prefixes]
+
+        self.trigram_postings = {}
+        for pos, words in enumerate(self.words):
+            for gram in trigrams(''.join(words)):
+                self.trigram_postings.setdefault(gram, []).append(pos)
+
+    def prefix_matches(self, word):
+        if word.isdigit():
+            number = word.lstrip('0')
+            return {
+                pos for pos, num in enumerate(self.nums)
+                if num.startswith(word) or num.lstrip('0').startswith(number)
+            }
+        start = bisect.bisect_left(self.prefix_words, word)
+        end = bisect.bisect_left(self.prefix_words, word + '\uffff', start)
+        return {pos for word, pos in self.prefixes[start:end]}
+
+    def search(self, query, limit=20):
+        words = search_words(query)
+        if not words:
+            return self.names[:limit]
+
+        matches = self.prefix_matches(words[0])
+        for word in words[1:]:
+            if not matches:
+                break
+            matches &= self.prefix_matches(word)
+
+        # Exact names first, then names starting with the first query word, then the rest,
+        # each group in Pokedex order. A name made only of punctuation has no words and can
+        # still match by number, so it goes with the rest.
+        def rank(pos):
+            if self.words[pos] == words:
+                return (0, pos)
+            if self.words[pos] and self.words[pos][0].startswith(words[0]):
+                return (1, pos)
+            return (2, pos)
+
+        if matches:
+            return [self.names[pos] for pos in sorted(matches, key=rank)[:limit]]
+
+        grams = trigrams(''.join(words))
+        counts = Counter(pos for gram in grams for pos in self.trigram_postings.get(gram, ()))
+        fuzzy = sorted(
+            (pos for pos, count in counts.items() if count >= len(grams) * self.TRIGRAM_MIN_SCORE),
+            key=lambda pos: (-counts[pos], pos)
+        )
+        return [self.names[pos] for pos in fuzzy[:limit]]
+
+class QueryCache:
+    # LRU cache of query results with a time-to-live per entry. Values are shared between
+    # callers, so cached DataFrames must be treated as read-only.
+    def __init__(self, max_size=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+def build_adjacency(sources, targets, size):
+    # Compressed adjacency arrays: the neighbours of node i are
+    # targets[offsets[i]:offsets[i + 1]], in edge order.
+    order = np.argsort(sources, kind='stable')
+    sorted_sources = sources[order]
+    offsets = np.searchsorted(sorted_sources, np.arange(size + 1))
+    return offsets, targets[order]
+
+def top_positions(scores, limit, exclude=()):
+    # Positions of the `limit` highest scores, ties broken by Pokedex order. The cut-off is
+    # found with a linear-time partition; of the many rows that can tie with it only the
+    # first ones are kept, so just `limit` rows are sorted.
+    scores = np.array(scores, dtype=float)
+    scores[list(exclude)] = -np.inf
+    limit = min(limit, len(scores) - len(set(exclude)))
+    if limit <= 0:
+        return np.array([], dtype=np.int64)
+    cut = len(scores) - limit
+    threshold = np.partition(scores, cut)[cut]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:limit - len(above)]
+    candidates = np.concatenate([above, tied])
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+class TypeMatrix:
+    # Pokemon x type indicator matrices (uint8): has_type[i, k] is 1 when Pokemon i has
+    # type k, weak[i, k] when it is weak to type k. Built once per load generation, so a
+    # matchup question over the whole catalog is a few array operations instead of joins.
+    def __init__(self, names, types, weaknesses, generation=None):
+        self.generation = generation
+        self.names = list(names)
+        self.positions = {name: i for i, name in enumerate(self.names)}
+        self.type_names = sorted({t for values in types for t in values} | {w for values in weaknesses for w in values})
+        self.columns = {type_name: k for k, type_name in enumerate(self.type_names)}
+
+        self.has_type = self.indicator(types)
+        self.weak = self.indicator(weaknesses)
+        # Type and weakness bits side by side, with their row sums, for Jaccard similarity.
+        self.features = np.hstack([self.has_type, self.weak])
+        self.feature_counts = self.features.sum(axis=1, dtype=np.int32)
+        # float32 copies for the products: numpy sends float matrix products to BLAS but
+        # loops over integer ones, several times slower. The counts stay exact below 2**24.
+        self.has_type_f = self.has_type.astype(np.float32)
+        self.weak_f = self.weak.astype(np.float32)
+        self.features_f = self.features.astype(np.float32)
+        # Pokemon with the same type combination hit the same Pokemon, and Pokemon with the
+        # same weakness set are hit by the same ones. The catalog has only a few hundred of
+        # each, so which combination hits which weakness set is worked out once here.
+        self.type_combos, self.type_combo_ids = self.distinct_rows(self.has_type)
+        self.weak_sets, self.weak_set_ids = self.distinct_rows(self.weak)
+        self.combo_hits = (self.type_combos.astype(np.float32) @ self.weak_sets.astype(np.float32).T > 0).astype(np.int64)
+
+    def indicator(self, lists):
+        lists = [list(values) for values in lists]
+        matrix = np.zeros((len(lists), len(self.type_names)), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(lists)), [len(values) for values in lists])
+        cols = np.fromiter((self.columns[t] for values in lists for t in values), dtype=np.int64, count=len(rows))
+        matrix[rows, cols] = 1
+        return matrix
+
+    def distinct_rows(self, matrix):
+        # Distinct 0/1 rows and each Pokemon's index among them. Rows are packed into one
+        # integer each first, which np.unique handles far faster than rows of a 2-D array.
+        bits = np.left_shift(1, np.arange(matrix.shape[1], dtype=np.int64))
+        distinct, ids = np.unique(matrix.astype(np.int64) @ bits, return_inverse=True)
+        return ((distinct[:, None] & bits) > 0).astype(np.uint8), ids.ravel()
+
+    def rows(self, names):
+        return list(dict.fromkeys(self.positions[name] for name in names if name in self.positions))
+
+    def type_list(self, matrix, pos):
+        return [self.type_names[k] for k in np.flatnonzero(matrix[pos])]
+
+    def counter_picks(self, target_names, limit=10):
+        # Scores every Pokemon against the targets: +1 per target weak to each of its
+        # types, -1 per type among the targets it is weak to. The targets are skipped.
+        targets = self.rows(target_names)
+        if not targets:
+            return []
+        hits = self.weak[targets].sum(axis=0, dtype=np.int32)
+        threats = self.has_type[targets].max(axis=0)
+        offense = (self.has_type_f @ hits.astype(np.float32)).astype(np.int64)
+        risk = (self.weak_f @ threats.astype(np.float32)).astype(np.int64)
+        picks = top_positions(offense - risk, limit, exclude=targets)
+        return [{
+            'name': self.names[i],
+            'score': int(offense[i] - risk[i]),
+            'types': self.type_list(self.has_type, i),
+            'hits': [t for t in self.type_list(self.has_type, i) if hits[self.columns[t]]],
+            'weak_to': [t for t in self.type_list(self.weak, i) if threats[self.columns[t]]]
+        } for i in picks]
+
+    def team_coverage(self, team_names, limit=5):
+        # Defense: how many members are weak to each type. Offense: the share of the
+        # catalog at least one member's type hits. Suggestions are the Pokemon that stack
+        # the fewest extra weaknesses on the team, then hit the most Pokemon it cannot yet.
+        team = self.rows(team_names)
+        if not team:
+            return None
+        weak_counts = self.weak[team].sum(axis=0, dtype=np.int32)
+        team_types = self.has_type[team].max(axis=0)
+        covered = (self.weak_f @ team_types.astype(np.float32)) > 0
+
+        stacked = (self.weak_f @ weak_counts.astype(np.float32)).astype(np.int64)
+        # Distinct uncovered Pokemon each candidate hits: uncovered Pokemon counted per
+        # weakness set, summed over the sets the candidate's type combination hits. A
+        # Pokemon weak to both of a candidate's types is counted once.
+        uncovered_sets = np.bincount(self.weak_set_ids[~covered], minlength=len(self.weak_sets))
+        gain = (self.combo_hits @ uncovered_sets)[self.type_combo_ids]
+        # One integer key orders by fewest stacked weaknesses first, then by most gain.
+        keys = -stacked * (int(gain.max(initial=0)) + 1) + gain
+        suggestions = top_positions(keys, limit, exclude=team)
+
+        return {
+            'team': [self.names[i] for i in team],
+            'weak_counts': {t: int(n) for t, n in zip(self.type_names, weak_counts) if n},
+            'shared_weaknesses': [t for t, n in zip(self.type_names, weak_counts) if n >= 2],
+            'unthreatened': [t for t, n in zip(self.type_names, weak_counts) if not n],
+            'coverage': float(covered.mean()) if len(covered) else 0.0,
+            'suggestions': [{
+                'name': self.names[i],
+                'types': self.type_list(self.has_type, i),
+                'stacked': int(stacked[i]),
+                'new_hits': int(gain[i])
+            } for i in suggestions]
+        }
+
+    def similar(self, name, limit=10):
+        # Jaccard similarity of the combined type and weakness sets against every Pokemon.
+        if name not in self.positions:
+            return []
+        pos = self.positions[name]
+        shared = (self.features_f @ self.features_f[pos]).astype(np.int32)
+        union = self.feature_counts + self.feature_counts[pos] - shared
+        similarity = np.divide(shared, union, out=np.zeros(len(union)), where=union > 0)
+        return [{
+            'name': self.names[i],
+            'similarity': float(similarity[i]),
+            'types': self.type_list(self.has_type, i)
+        } for i in top_positions(similarity, limit, exclude=[pos])]
+
+class PokedexSnapshot:
+    # Read-only copy of the whole database, indexed for the dashboard's lookups. Built in
+    # one pass over the eight tables and replaced as a whole, never mutated.
+    TABLES = ["Candy", "Egg", "Pokemon", "Type", "PokemonType", "Weakness", "PokemonWeakness", "Evolution"]
+
+    def __init__(self, tables, generation=None):
+        self.generation = generation
+
+        pokemon = tables['Pokemon'].sort_values('pokemon_id').reset_index(drop=True)
+        pokemon = pokemon.merge(tables['Egg'], on='egg_id', how='left')
+        self.names = pokemon['name'].tolist()
+        self.nums = pokemon['num'].astype(str).tolist()
+
+        positions = pd.Series(np.arange(len(pokemon)), index=pokemon['pokemon_id'])
+
+        types = tables['PokemonType'].merge(tables['Type'], on='type_id').sort_values(['pokemon_id', 'type_id'])
+        weaknesses = tables['PokemonWeakness'].merge(tables['Weakness'], on='weakness_id').sort_values(['pokemon_id', 'weakness_id'])
+        evolutions = tables['Evolution'].sort_values('evolution_id')
+        costs = {
+            pokemon_id: 'N/A' if pd.isna(cost) else int(cost)
+            for pokemon_id, cost in evolutions.drop_duplicates('from_pokemon_id')[['from_pokemon_id', 'cost']].itertuples(index=False)
+        }
+
+        # Decimals come back from MySQL as Decimal and from the Arrow export as float64, so
+        # both are formatted to the column's scale to show as the SQL queries do (0.70, not 0.7).
+        def na(value, places):
+            return 'N/A' if value is None or pd.isna(value) else f"{float(value):.{places}f}"
+
+        profiles = pd.DataFrame({
+            'pokemon_id': pokemon['pokemon_id'],
+            'num': '#' + pokemon['num'].astype(str),
+            'img_url': pokemon['img_url'].fillna('https://via.placeholder.com/200?text=No+Image'),
+            'height': pokemon['height_m'].map(lambda value: na(value, 2)),
+            'weight': pokemon['weight_kg'].map(lambda value: na(value, 2)),
+            'egg_distance': pokemon['distance_km'].map(lambda value: na(value, 1)),
+            'candy_count': pokemon['pokemon_id'].map(lambda pokemon_id: costs.get(pokemon_id, 'N/A')),
+            'types': pokemon['pokemon_id'].map(types.groupby('pokemon_id')['type_name'].agg(list)),
+            'weaknesses': pokemon['pokemon_id'].map(weaknesses.groupby('pokemon_id')['weakness_name'].agg(list))
+        })
+        profiles.index = pokemon['name']
+        profiles['types'] = profiles['types'].map(lambda v: v if isinstance(v, list) else [])
+        profiles['weaknesses'] = profiles['weaknesses'].map(lambda v: v if isinstance(v, list) else [])
+        self.profiles = profiles[~profiles.index.duplicated()]
+        self.type_matrix = TypeMatrix(self.profiles.index, self.profiles['types'], self.profiles['weaknesses'], generation)
+
+        self.type_counts = (
+            types.groupby('type_name').size().reset_index(name='type_count')
+            .sort_values('type_count', ascending=False, kind='stable').reset_index(drop=True)
+        )
+
+        from_pos = positions.reindex(evolutions['from_pokemon_id']).to_numpy()
+        to_pos = positions.reindex(evolutions['to_pokemon_id']).to_numpy()
+        valid = ~(np.isnan(from_pos.astype(float)) | np.isnan(to_pos.astype(float)))
+        from_pos = from_pos[valid].astype(np.int64)
+        to_pos = to_pos[valid].astype(np.int64)
+        self.child_offsets, self.children = build_adjacency(from_pos, to_pos, len(pokemon))
+        self.parent_offsets, self.parents = build_adjacency(to_pos, from_pos, len(pokemon))
+        self.positions = pd.Series(np.arange(len(pokemon)), index=pokemon['name'])
+        self.positions = self.positions[~self.positions.index.duplicated()]
+
+    @classmethod
+    def load(cls, conn):
+        tables = {table: pd.read_sql(text(f"SELECT * FROM {table}"), conn) for table in cls.TABLES}
+        try:
+            generation = read_generation(conn)
+        except Exception:
+            generation = None
+        return cls(tables, generation)
+
+    @classmethod
+    def load_arrow(cls, directory):
+        tables = {table: read_arrow_table(directory, table) for table in cls.TABLES}
+        return cls(tables, read_arrow_generation(directory))
+
+    def pokemon_data(self, name):
+        if name not in self.profiles.index:
+            return None
+        row = self.profiles.loc[name]
+        return {
+            "name": name,
+            "num": row['num'],
+            "img_url": row['img_url'],
+            "height": row['height'],
+            "weight": row['weight'],
+            "egg_distance": row['egg_distance'],
+            "candy_count": row['candy_count'],
+            "types": row['types'],
+            "weaknesses": row['weaknesses'],
+            "weakness_counts_df": self.type_counts
+        }
+
+    def evolution_chain(self, start_name):
+        # Same walk as SQL_EVOLUTION_FAMILY: deepest ancestor first, then every descendant
+        # ordered by depth and pokemon_id.
+        if start_name not in self.positions.index:
+            return []
+
+        start = int(self.positions[start_name])
+        root, root_depth = start, 0
+        frontier, depth, seen = [start], 0, {start}
+        while frontier and depth < 20:
+            depth += 1
+            frontier = [int(p) for node in frontier for p in self.parents[self.parent_offsets[node]:self.parent_offsets[node + 1]]]
+            for node in frontier:
+                if depth > root_depth or (depth == root_depth and node < root):
+                    root, root_depth = node, depth
+            frontier = [node for node in frontier if node not in seen]
+            seen.update(frontier)
+
+        depths = {root: 0}
+        frontier, depth = [root], 0
+        while frontier and depth < 20:
+            depth += 1
+            next_frontier = []
+            for node in frontier:
+                for child in self.children[self.child_offsets[node]:self.child_offsets[node + 1]]:
+                    child = int(child)
+                    if child not in depths:
+                        depths[child] = depth
+                        next_frontier.append(child)
+            frontier = next_frontier
+
+        chain = []
+        for pos in sorted(depths, key=lambda p: (depths[p], p)):
+            name = self.names[pos]
+            row = self.profiles.loc[name]
+            chain.append({
+                'name': name,
+                'num': row['num'],
+                'img_url': row['img_url'],
+                'is_current': name == start_name
+            })
+        return chain
+
+class PoolMetrics:
+    # Time spent waiting for a pooled connection, which includes pre-ping and opening new
+    # connections when the pool is empty.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds):
+        with self.lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def record_timeout(self):
+        with self.lock:
+            self.timeouts += 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait": self.total_wait / self.checkouts if self.checkouts else 0.0,
+                "max_wait": self.max_wait
+            }
+
+class QueryMetrics:
+    # Per-query database timings, labelled by the query's DASHBOARD_QUERIES name, plus the
+    # number of queries each callback sends. Cumulative histogram buckets feed the
+    # Prometheus /metrics route; a rolling window of recent durations gives local p50/p99.
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+    QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21)
+
+    def __init__(self, window=QUERY_METRICS_WINDOW):
+        self.lock = threading.Lock()
+        self.window = window
+        self.queries = {}
+        self.callbacks = {}
+
+    def query(self, label):
+        if label not in self.queries:
+            self.queries[label] = {
+                "count": 0, "errors": 0, "cache_hits": 0, "seconds": 0.0, "rows": 0,
+                "buckets": [0] * len(self.BUCKETS), "recent": deque(maxlen=self.window)
+            }
+        return self.queries[label]
+
+    def record(self, label, seconds, rows):
+        with self.lock:
+            entry = self.query(label)
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["rows"] += rows
+            entry["recent"].append(seconds)
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+
+    def record_cache_hit(self, label):
+        with self.lock:
+            self.query(label)["cache_hits"] += 1
+
+    def record_error(self, label):
+        with self.lock:
+            self.query(label)["errors"] += 1
+
+    def record_callback(self, name, queries):
+        with self.lock:
+            entry = self.callbacks.setdefault(name, {"count": 0, "queries": 0, "buckets": [0] * len(self.QUERY_COUNT_BUCKETS)})
+            entry["count"] += 1
+            entry["queries"] += queries
+            for i, bound in enumerate(self.QUERY_COUNT_BUCKETS):
+                if queries <= bound:
+                    entry["buckets"][i] += 1
+
+    def stats(self):
+        with self.lock:
+            stats = {}
+            for label, entry in self.queries.items():
+                recent = sorted(entry["recent"])
+                stats[label] = {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "cache_hits": entry["cache_hits"],
+                    "rows": entry["rows"],
+                    "rows_per_sec": entry["rows"] / entry["seconds"] if entry["seconds"] else 0.0,
+                    "p50": recent[len(recent) // 2] if recent else 0.0,
+                    "p99": recent[min(len(recent) - 1, int(len(recent) * 0.99))] if recent else 0.0
+                }
+            return stats
+
+    def prometheus(self):
+        lines = []
+
+        def histogram(name, help_text, label_name, entries, bounds, total_key):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for label, entry in entries.items():
+                for bound, count in zip(bounds, entry["buckets"]):
+                    lines.append(f'{name}_bucket{{{label_name}="{label}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{label_name}="{label}",le="+Inf"}} {entry["count"]}')
+                lines.append(f'{name}_sum{{{label_name}="{label}"}} {entry[total_key]}')
+                lines.append(f'{name}_count{{{label_name}="{label}"}} {entry["count"]}')
+
+        def counter(name, help_text, key):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for label, entry in self.queries.items():
+                lines.append(f'{name}{{query="{label}"}} {entry[key]}')
+
+        with self.lock:
+            histogram("pokedex_query_duration_seconds", "Database time per dashboard query.",
+                      "query", self.queries, self.BUCKETS, "seconds")
+            counter("pokedex_query_rows_total", "Rows returned by dashboard queries.", "rows")
+            counter("pokedex_query_errors_total", "Dashboard queries that raised an error.", "errors")
+            counter("pokedex_query_cache_hits_total", "Dashboard queries answered from the query cache.", "cache_hits")
+            histogram("pokedex_callback_queries", "Database queries sent per callback.",
+                      "callback", self.callbacks, self.QUERY_COUNT_BUCKETS, "queries")
+        return "\n".join(lines) + "\n"
+
+# Innermost open span of the current trace, if any; copied into query pool threads along
+# with callback_queries.
+current_span = contextvars.ContextVar('current_span', default=None)
+
+class Tracer:
+    # Opt-in span tracing for callbacks. A trace is a tree of named, timed spans; the
+    # last TRACE_WINDOW finished traces are kept for the debug routes. Spans opened
+    # outside a trace, or with tracing off, cost one check and record nothing.
+    def __init__(self, enabled=TRACING, window=TRACE_WINDOW):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.traces = deque(maxlen=window)
+
+    @contextmanager
+    def span(self, name):
+        parent = current_span.get()
+        if parent is None:
+            yield
+            return
+
+        span = {"name": name, "start": time.perf_counter(), "duration": 0.0, "children": []}
+        parent["children"].append(span)
+        token = current_span.set(span)
+        try:
+            yield
+        finally:
+            span["duration"] = time.perf_counter() - span["start"]
+            current_span.reset(token)
+
+    def call(self, name, function, *args):
+        with self.span(name):
+            return function(*args)
+
+    @contextmanager
+    def trace(self, name, **attrs):
+        if not self.enabled:
+            yield
+            return
+
+        root = {"name": name, "attrs": attrs, "time": time.time(), "start": time.perf_counter(), "duration": 0.0, "children": []}
+        token = current_span.set(root)
+        try:
+            yield
+        finally:
+            root["duration"] = time.perf_counter() - root["start"]
+            current_span.reset(token)
+            with self.lock:
+                self.traces.append(root)
+
+    def recent(self):
+        def export(span, origin):
+            return {
+                "name": span["name"],
+                "offset_ms": (span["start"] - origin) * 1000,
+                "duration_ms": span["duration"] * 1000,
+                "children": [export(child, origin) for child in span["children"]]
+            }
+
+        with self.lock:
+            traces = list(self.traces)
+        return [
+            dict(export(root, root["start"]), attrs={k: str(v) for k, v in root["attrs"].items()}, time=root["time"])
+            for root in traces
+        ]
+
+    def collapsed(self):
+        # One "root;child;grandchild <microseconds>" line per stack with its self time
+        # summed over the window, the input format of flamegraph.pl and speedscope.
+        # Children that ran in parallel can outlast their parent; self time stops at zero.
+        totals = Counter()
+
+        def walk(span, stack):
+            stack = stack + [span["name"]]
+            child_time = sum(child["duration"] for child in span["children"])
+            totals[";".join(stack)] += max(0.0, span["duration"] - child_time)
+            for child in span["children"]:
+                walk(child, stack)
+
+        with self.lock:
+            traces = list(self.traces)
+        for root in traces:
+            walk(root, [])
+        return "".join(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in totals.items())
+
+tracer = Tracer()
+
 class PokedexDataFetcher:
     def __init__(self):
         self.engine = None
+        self.engine_lock = threading.Lock()
+        self.connect_failures = 0
+        self.next_connect_attempt = 0.0
+        self.pool_metrics = PoolMetrics()
+        self.query_metrics = QueryMetrics()
+        self.supports_cte = None
+        self.supports_summaries = None
+        self.cache = QueryCache()
+        self.generation = None
+        self.generation_checked_at = 0.0
+        self.snapshot = None
+        self.snapshot_thread = None
+        self.type_matrix = None
+        self.query_pool = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix='pokedex-query')
+
+    def connect(self):
+        # Creates the engine on first use. After a failure, further attempts are skipped
+        # until an exponentially growing backoff has passed, so a database outage does not
+        # make every request wait on a connect timeout.
+        if self.engine is not None:
+            return self.engine
+
+        with self.engine_lock:
+            if self.engine is not None or time.monotonic() < self.next_connect_attempt:
+                return self.engine
+
+            try:
+                host = os.environ.get("DB_HOST", DB_HOST)
+                user = os.environ.get("DB_USER", DB_USER)
+                password = os.environ.get("DB_PASS", DB_PASS)
+                name = os.environ.get("DB_NAME", DB_NAME)
+
+                # DB_URL points the dashboard at any other SQLAlchemy database, such as the
+                # SQLite stand-in used by pokedex-benchmark.py.
+                db_url = os.environ.get("DB_URL") or f"mysql+pymysql://{user}:{password}@{host}:3306/{name}"
+                engine = create_engine(
+                    db_url,
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_recycle=DB_POOL_RECYCLE,
+                    pool_timeout=DB_POOL_TIMEOUT,
+                    pool_pre_ping=DB_POOL_PRE_PING
+                )
+
+                with engine.begin() as conn:
+                    conn.execute(text("SELECT 1"))
+
+                print("Database connection successful.")
+                self.engine = engine
+                self.connect_failures = 0
 
+            except Exception as e:
+                self.connect_failures += 1
+                backoff = min(DB_RECONNECT_MAX_BACKOFF, DB_RECONNECT_BACKOFF * 2 ** (self.connect_failures - 1))
+                self.next_connect_attempt = time.monotonic() + backoff
+                print(f"Database connection failed (retrying in {backoff:.0f}s): {e}")
+
+        return self.engine
+
+    def open_connection(self):
+        start = time.perf_counter()
         try:
-            host = os.environ.get("DB_HOST", DB_HOST)
-            user = os.environ.get("DB_USER", DB_USER)
-            password = os.environ.get("DB_PASS", DB_PASS)
-            name = os.environ.get("DB_NAME", DB_NAME)
+            conn = self.engine.connect()
+        except SQLAlchemyTimeoutError:
+            self.pool_metrics.record_timeout()
+            raise
+        self.pool_metrics.record(time.perf_counter() - start)
+        return conn
 
-            db_url = f"mysql+pymysql://{user}:{password}@{host}:3306/{name}"
-            self.engine = create_engine(db_url)
-            
-            with self.engine.begin() as conn:
-                conn.execute(text("SELECT 1"))
+    def pool_stats(self):
+        stats = self.pool_metrics.stats()
+        if self.engine is not None:
+            stats["pool_status"] = self.engine.pool.status()
+        return stats
 
-            print("Database connection successful.")
-            
+    def after_fork(self):
+        # Runs in each server worker right after the fork. Pooled connections, locks and
+        # threads were inherited from the parent: the worker forgets the parent's
+        # connections without closing their sockets and starts its own threads.
+        self.engine_lock = threading.Lock()
+        if self.engine is not None:
+            self.engine.dispose(close=False)
+        self.query_pool = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix='pokedex-query')
+        if self.snapshot_thread is not None:
+            self.snapshot_thread = threading.Thread(target=self.watch_snapshot, daemon=True)
+            self.snapshot_thread.start()
+
+    def health(self):
+        database = False
+        if not ARROW_DIR and self.connect():
+            try:
+                with self.open_connection() as conn:
+                    conn.execute(text("SELECT 1"))
+                database = True
+            except Exception as e:
+                print(f"Health check query failed: {e}")
+
+        # A snapshot keeps answering while the database is away.
+        return {
+            "status": "ok" if database or self.snapshot is not None else "unavailable",
+            "database": database,
+            "snapshot": self.snapshot is not None,
+            "generation": self.data_generation()
+        }
+
+    def refresh_snapshot(self):
+        # Builds the new snapshot off to the side and swaps the reference in one assignment,
+        # so readers see either the old or the new data, never a mix. On failure the
+        # current snapshot stays in place. With ARROW_DIR set the snapshot is read from the
+        # loader's exported files and the database is never touched.
+        if not ARROW_DIR and not self.connect():
+            return False
+        try:
+            if ARROW_DIR:
+                snapshot = PokedexSnapshot.load_arrow(ARROW_DIR)
+            else:
+                with self.open_connection() as conn:
+                    snapshot = PokedexSnapshot.load(conn)
         except Exception as e:
-            print(f"Database connection failed: {e}")
-            self.engine = None
+            print(f"Snapshot refresh failed: {e}")
+            return False
+        self.snapshot = snapshot
+        print(f"Loaded in-memory snapshot of {len(snapshot.names)} Pokemon (generation {snapshot.generation}).")
+        return True
+
+    def enable_snapshot(self):
+        self.refresh_snapshot()
+
+        if self.snapshot_thread is None:
+            self.snapshot_thread = threading.Thread(target=self.watch_snapshot, daemon=True)
+            self.snapshot_thread.start()
+
+    def watch_snapshot(self):
+        while True:
+            time.sleep(SNAPSHOT_REFRESH_INTERVAL)
+            if self.snapshot is None:
+                self.refresh_snapshot()
+                continue
+            try:
+                generation = self.read_source_generation()
+            except Exception:
+                continue
+            if generation != self.snapshot.generation:
+                self.refresh_snapshot()
+
+    def read_source_generation(self):
+        if ARROW_DIR:
+            return read_arrow_generation(ARROW_DIR)
+        if not self.connect():
+            raise RuntimeError("No database connection.")
+        with self.open_connection() as conn:
+            return read_generation(conn)
+
+    def check_generation(self):
+        # The loader bumps LoadGeneration after every load; a new value means every cached
+        # result is stale. Checked at most once per GENERATION_CHECK_INTERVAL seconds.
+        now = time.monotonic()
+        if now - self.generation_checked_at < GENERATION_CHECK_INTERVAL:
+            return
+        self.generation_checked_at = now
+
+        try:
+            with self.open_connection() as conn:
+                generation = read_generation(conn)
+        except Exception:
+            return
+
+        if generation != self.generation:
+            if self.generation is not None:
+                print(f"Load generation changed to {generation}, clearing query cache.")
+            self.cache.clear()
+            # The summary tables may have been missing only while a load had them dropped,
+            # or a migration may have added them; a new load is worth trying them again.
+            self.supports_summaries = None
+            self.generation = generation
+
+    def read_sql(self, sql, params=None):
+        self.check_generation()
+
+        label = QUERY_LABELS.get(sql, 'other')
+        key = (sql, tuple(sorted((params or {}).items())))
+        df = self.cache.get(key)
+        if df is not None:
+            self.query_metrics.record_cache_hit(label)
+            return df
+
+        queries = callback_queries.get()
+        if queries is not None:
+            queries.append(label)
+
+        start = time.perf_counter()
+        try:
+            with tracer.span(f"query:{label}"), self.open_connection() as conn:
+                df = pd.read_sql(text(sql), conn, params=params)
+        except Exception:
+            self.query_metrics.record_error(label)
+            raise
+        seconds = time.perf_counter() - start
+
+        self.query_metrics.record(label, seconds, len(df))
+        if seconds >= SLOW_QUERY_SECONDS:
+            print(f"Slow query {label}: {seconds * 1000:.0f} ms, {len(df)} rows, params {params}")
+
+        self.cache.put(key, df)
+        return df
 
     def execute_query(self, sql, params=None):
-        if not self.engine:
+        if not self.connect():
             return pd.DataFrame()
         try:
-            return pd.read_sql(text(sql), self.engine, params=params)
+            return self.read_sql(sql, params)
         except Exception as e:
             print(f"Database query error: {e}")
             return pd.DataFrame()
 
+    def data_generation(self):
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot.generation
+        if self.connect():
+            self.check_generation()
+        return self.generation
+
+    def cache_stats(self):
+        return dict(self.cache.stats(), generation=self.generation)
+
+    def prometheus_metrics(self):
+        cache = self.cache.stats()
+        pool = self.pool_metrics.stats()
+        gauges = [
+            ("pokedex_query_cache_lookups_total", "counter", "Query cache lookups by result.",
+             [('result="hit"', cache["hits"]), ('result="miss"', cache["misses"])]),
+            ("pokedex_pool_checkouts_total", "counter", "Connections checked out of the pool.", [("", pool["checkouts"])]),
+            ("pokedex_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection.", [("", pool["timeouts"])]),
+            ("pokedex_pool_max_wait_seconds", "gauge", "Longest wait for a pooled connection.", [("", pool["max_wait"])])
+        ]
+        lines = []
+        for name, kind, help_text, samples in gauges:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}" for labels, value in samples)
+        return self.query_metrics.prometheus() + "\n".join(lines) + "\n"
+
+    def check_query_plans(self, sample_name='Pikachu'):
+        # Runs EXPLAIN on every dashboard query and raises if a table that should be
+        # reached through an index is read with a full scan (access type ALL).
+        if not self.connect():
+            raise RuntimeError("No database connection to check query plans against.")
+
+        full_scans = []
+
+        for label, (sql, allowed_scans) in DASHBOARD_QUERIES.items():
+            with self.open_connection() as conn:
+                plan = pd.read_sql(text("EXPLAIN " + sql), conn, params={'p_name': sample_name})
+
+            print(f"{label:<16} {', '.join(f'{t}:{k}' for t, k in zip(plan['table'], plan['type']))}")
+
+            scanned = [
+                t for t in plan[plan['type'] == 'ALL']['table'].tolist()
+                if t not in allowed_scans and not (str(t).startswith('<derived') and '<derived>' in allowed_scans)
+            ]
+            if scanned:
+                full_scans.append(f"{label} scans {', '.join(scanned)}")
+
+        if full_scans:
+            raise RuntimeError("Full table scans in dashboard queries: " + "; ".join(full_scans))
+
+        print("All dashboard queries use indexed access.")
+
+    def fetch_pokemon_catalog(self):
+        # (name, num) of every Pokemon in Pokedex order.
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return list(zip(snapshot.names, snapshot.nums))
+
+        df = self.execute_query(SQL_ALL_NAMES)
+        if df.empty:
+            return []
+        return list(zip(df['name'], df['num'].astype(str)))
+
     def fetch_all_pokemon_names(self):
-        sql = "SELECT name FROM Pokemon ORDER BY pokemon_id"
-        df = self.execute_query(sql)
-        return df['name'].tolist()
+        return [name for name, num in self.fetch_pokemon_catalog()]
+
+    def fetch_type_counts(self):
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot.type_counts
+
+        if self.supports_summaries is not False:
+            df = self.execute_query(SQL_TYPE_COUNT_TABLE)
+            if not df.empty:
+                return df
+        return self.execute_query(SQL_TYPE_COUNTS)
+
+    def fetch_weakness_map(self):
+        # Every Pokemon's weaknesses in one query, for the browser-side bar highlighting.
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot.profiles['weaknesses'].to_dict()
+
+        df = self.execute_query(SQL_WEAKNESS_MAP)
+        if df.empty:
+            return {}
+        return df.groupby('name', sort=False)['weakness_name'].agg(list).to_dict()
+
+    def fetch_type_matrix(self):
+        # The snapshot carries its own matrix. Otherwise it is built from two whole-table
+        # queries and kept until the load generation changes.
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot.type_matrix
+
+        generation = self.data_generation()
+        matrix = self.type_matrix
+        if matrix is not None and matrix.generation == generation:
+            return matrix
+
+        names = list(dict.fromkeys(self.fetch_all_pokemon_names()))
+        if not names:
+            return None
+        types_df = self.execute_query(SQL_TYPE_MAP)
+        types = types_df.groupby('name', sort=False)['type_name'].agg(list).to_dict() if not types_df.empty else {}
+        weaknesses = self.fetch_weakness_map()
+
+        start = time.perf_counter()
+        matrix = TypeMatrix(names, [types.get(name, []) for name in names], [weaknesses.get(name, []) for name in names], generation)
+        print(f"Built type matrix of {len(names)} Pokemon x {len(matrix.type_names)} types in {(time.perf_counter() - start) * 1000:.1f} ms.")
+        self.type_matrix = matrix
+        return matrix
+
+    def fetch_counter_picks(self, target_names, limit=10):
+        matrix = self.fetch_type_matrix()
+        return matrix.counter_picks(target_names, limit) if matrix is not None else []
+
+    def fetch_team_coverage(self, team_names, limit=5):
+        matrix = self.fetch_type_matrix()
+        return matrix.team_coverage(team_names, limit) if matrix is not None else None
+
+    def fetch_similar_pokemon(self, name, limit=10):
+        matrix = self.fetch_type_matrix()
+        return matrix.similar(name, limit) if matrix is not None else []
 
     def fetch_evolution_chain(self, start_name):
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot.evolution_chain(start_name)
+
+        if not self.connect() or not start_name:
+            return []
+
+        if self.supports_cte is not False:
+            try:
+                df_family = self.read_sql(SQL_EVOLUTION_FAMILY, {'p_name': start_name})
+                self.supports_cte = True
+            except Exception as e:
+                if is_programming_error(e) and mysql_error_code(e) == MYSQL_SYNTAX_ERROR:
+                    # Servers without WITH RECURSIVE (MySQL < 8.0) reject the query as a syntax error.
+                    print(f"Recursive CTE unavailable, using per-node evolution queries: {e}")
+                    self.supports_cte = False
+                else:
+                    print(f"Database query error: {e}")
+            else:
+                return [
+                    {
+                        'name': row['name'],
+                        'num': f"#{row['num']}",
+                        'img_url': row['img_url'],
+                        'is_current': row['name'] == start_name
+                    }
+                    for index, row in df_family.iterrows()
+                ]
+
+        return self.fetch_evolution_chain_iterative(start_name)
+
+    def fetch_evolution_chain_iterative(self, start_name):
         chain = deque()
         seen_names = set()
         root_name = start_name
@@ -56,14 +1243,7 @@ class PokedexDataFetcher:
 
         while True:
             params = {'p_name': current_name}
-            sql_prev = """
-                SELECT prev_poke.name AS prev_evolution_name
-                FROM Pokemon current_poke
-                JOIN Evolution e ON current_poke.pokemon_id = e.to_pokemon_id
-                JOIN Pokemon prev_poke ON e.from_pokemon_id = prev_poke.pokemon_id
-                WHERE current_poke.name = :p_name
-            """
-            df_prev = self.execute_query(sql_prev, params)
+            df_prev = self.execute_query(SQL_PREV_EVOLUTION, params)
             if df_prev.empty or df_prev.iloc[0]['prev_evolution_name'] in seen_names:
                 break
             
@@ -82,7 +1262,7 @@ class PokedexDataFetcher:
                 continue
 
             name_set.add(name)
-            data = self.fetch_pokemon_data(name)
+            data = self.fetch_pokemon_summary(name)
 
             if data:
                 chain_list.append({
@@ -93,16 +1273,7 @@ class PokedexDataFetcher:
                 })
                 
                 params = {'p_name': data['name']}
-
-                sql_next = """
-                    SELECT next_poke.name AS next_evolution_name
-                    FROM Pokemon current_poke
-                    JOIN Evolution e ON current_poke.pokemon_id = e.from_pokemon_id
-                    JOIN Pokemon next_poke ON e.to_pokemon_id = next_poke.pokemon_id
-                    WHERE current_poke.name = :p_name
-                """
-
-                df_next = self.execute_query(sql_next, params)
+                df_next = self.execute_query(SQL_NEXT_EVOLUTION, params)
 
                 for index, row in df_next.iterrows():
                     queue.append(row['next_evolution_name'])
@@ -110,87 +1281,160 @@ class PokedexDataFetcher:
         return chain_list
 
     def fetch_pokemon_data(self, name):
-        if not self.engine or not name:
+        snapshot = self.snapshot
+        if snapshot is not None:
+            return snapshot.pokemon_data(name)
+
+        if not self.connect() or not name:
             return None
-            
-        params = {'p_name': name}
-
-        sql_core_kpi = """
-            SELECT 
-                p.pokemon_id, p.num, p.name, 
-                COALESCE(p.height_m, 'N/A') AS height_m, 
-                COALESCE(p.weight_kg, 'N/A') AS weight_kg, 
-                COALESCE(p.candy_id, 'N/A') AS candy_count, 
-                COALESCE(p.egg_distance_km, 'N/A') AS egg_distance_km, 
-                COALESCE(p.img_url, 'https://via.placeholder.com/200?text=No+Image') AS img_url 
-            FROM Pokemon p 
-            WHERE p.name = :p_name
-        """
-
-        sql_types = """
-            SELECT t.type_name
-            FROM Pokemon p JOIN PokemonType pt ON p.pokemon_id = pt.pokemon_id
-            JOIN Type t ON pt.type_id = t.type_id
-            WHERE p.name = :p_name
-        """
-
-        sql_weaknesses = """
-            SELECT w.weakness_name
-            FROM Pokemon p JOIN PokemonWeakness pw ON p.pokemon_id = pw.pokemon_id
-            JOIN Weakness w ON pw.weakness_id = w.weakness_id
-            WHERE p.name = :p_name
-        """
-
-        sql_type_counts = """
-            SELECT 
-                t.type_name,
-                COUNT(pt.pokemon_id) AS type_count
-            FROM Type t 
-            JOIN PokemonType pt ON t.type_id = pt.type_id
-            GROUP BY t.type_name
-            ORDER BY type_count DESC
-        """
-
-        sql_candy_cost = """
-            SELECT COALESCE(e.cost, 'N/A') AS evolution_cost
-            FROM Pokemon p
-            LEFT JOIN Evolution e ON p.pokemon_id = e.from_pokemon_id
-            WHERE p.name = :p_name
-            LIMIT 1
-        """
-
-        df_core_kpi = self.execute_query(sql_core_kpi, params)
-
-        if df_core_kpi.empty: return None
-
-        core_data = df_core_kpi.iloc[0].to_dict()
-
-        types = self.execute_query(sql_types, params)['type_name'].tolist()
-        weaknesses = self.execute_query(sql_weaknesses, params)['weakness_name'].tolist()
-        df_type_counts = self.execute_query(sql_type_counts)
-        
-        df_candy_cost = self.execute_query(sql_candy_cost, params)
-        evolution_cost = df_candy_cost.iloc[0]['evolution_cost'] if not df_candy_cost.empty else 'N/A'
+
+        profile, df_type_counts = self.read_profile(name)
+
+        if profile is None: return None
 
         return {
-            "name": core_data['name'],
-            "num": f"#{core_data['num']}",
-            "img_url": core_data['img_url'],
-            "height": core_data['height_m'],
-            "weight": core_data['weight_kg'],
-            "egg_distance": core_data['egg_distance_km'],
-            "candy_count": evolution_cost, 
-            "types": types,
-            "weaknesses": weaknesses,
+            "name": profile['name'],
+            "num": f"#{profile['num']}",
+            "img_url": profile['img_url'],
+            "height": profile['height_m'],
+            "weight": profile['weight_kg'],
+            "egg_distance": profile['egg_distance_km'],
+            "candy_count": profile['evolution_cost'], 
+            "types": split_list(profile['types']),
+            "weaknesses": split_list(profile['weaknesses']),
             "weakness_counts_df": df_type_counts
         }
 
+    def read_profile(self, name):
+        # Checked first, so a new load generation re-enables the summary tables for this
+        # very request.
+        self.check_generation()
+        if self.supports_summaries is not False:
+            try:
+                df_profile = self.read_sql(SQL_PROFILE_TABLE, {'p_name': name})
+                df_type_counts = self.read_sql(SQL_TYPE_COUNT_TABLE)
+                self.supports_summaries = True
+            except Exception as e:
+                if not is_programming_error(e):
+                    print(f"Database query error: {e}")
+                    return None, None
+                # Databases loaded before the summary tables existed fall back to the joined
+                # query until the next load generation (see check_generation).
+                print(f"Summary tables unavailable, using joined profile query: {e}")
+                self.supports_summaries = False
+            else:
+                # Empty summaries (a load still in progress) fall back for this request only,
+                # like fetch_type_counts.
+                if not df_profile.empty and not df_type_counts.empty:
+                    return df_profile.iloc[0].to_dict(), df_type_counts
+
+        df_profile = self.execute_query(SQL_PROFILE, {'p_name': name})
+
+        if df_profile.empty:
+            return None, None
+
+        profile = df_profile.iloc[0].to_dict()
+
+        type_counts = [item.rsplit(':', 1) for item in split_list(profile['type_counts'])]
+        df_type_counts = pd.DataFrame({
+            'type_name': [type_name for type_name, count in type_counts],
+            'type_count': [int(count) for type_name, count in type_counts]
+        })
+        return profile, df_type_counts
+
+    def fetch_dashboard_data(self, name, concurrent=CONCURRENT_QUERIES):
+        # The profile and the evolution family are independent queries, so by default they
+        # run side by side on the query pool and the callback waits for the slower one
+        # instead of their sum.
+        if not concurrent or self.snapshot is not None:
+            return tracer.call("profile", self.fetch_pokemon_data, name), tracer.call("evolution_chain", self.fetch_evolution_chain, name)
+
+        profile = self.query_pool.submit(contextvars.copy_context().run, tracer.call, "profile", self.fetch_pokemon_data, name)
+        chain = self.query_pool.submit(contextvars.copy_context().run, tracer.call, "evolution_chain", self.fetch_evolution_chain, name)
+        return profile.result(), chain.result()
+
+    def compare_fetch_latency(self, names, repeats=3):
+        # Serial versus concurrent fetch for the same selections. The cache is cleared
+        # before every pass so both modes pay for real round trips.
+        results = {}
+        for mode, concurrent in (("serial", False), ("concurrent", True)):
+            timings = []
+            for _ in range(repeats):
+                for name in names:
+                    self.cache.clear()
+                    start = time.perf_counter()
+                    self.fetch_dashboard_data(name, concurrent)
+                    timings.append(time.perf_counter() - start)
+            timings.sort()
+            results[mode] = {
+                "mean": sum(timings) / len(timings),
+                "p50": timings[len(timings) // 2],
+                "max": timings[-1]
+            }
+            print(f"{mode:<10} mean {results[mode]['mean'] * 1000:7.2f} ms  "
+                  f"p50 {results[mode]['p50'] * 1000:7.2f} ms  max {results[mode]['max'] * 1000:7.2f} ms")
+        return results
+
+    def fetch_pokemon_summary(self, name):
+        # Lightweight variant for evolution-chain nodes, which only show name, number and image.
+        snapshot = self.snapshot
+        if snapshot is not None:
+            data = snapshot.pokemon_data(name)
+            return {key: data[key] for key in ("name", "num", "img_url")} if data else None
+
+        if not self.connect() or not name:
+            return None
+
+        df_summary = self.execute_query(SQL_SUMMARY, {'p_name': name})
+
+        if df_summary.empty: return None
+
+        summary = df_summary.iloc[0].to_dict()
+        return {
+            "name": summary['name'],
+            "num": f"#{summary['num']}",
+            "img_url": summary['img_url']
+        }
+
 pokedex_fetcher = PokedexDataFetcher()
-ALL_POKEMON_NAMES = pokedex_fetcher.fetch_all_pokemon_names()
-DEFAULT_POKEMON = 'Pikachu' if 'Pikachu' in ALL_POKEMON_NAMES else (ALL_POKEMON_NAMES[0] if ALL_POKEMON_NAMES else None)
+startup_lock = threading.Lock()
+pokemon_name_list = []
+pokemon_search_index = PokemonSearchIndex([])
+pokemon_name_generation = None
+
+def pokemon_names():
+    # The name list and its search index, and the snapshot (SNAPSHOT_MODE, ARROW_DIR), are
+    # loaded on first use instead of at import, so importing the module never touches the
+    # database. They are rebuilt when the load generation changes, so Pokemon added by a
+    # reload become searchable without a restart. An empty list from an unreachable
+    # database is not kept; the next call tries again.
+    global pokemon_name_list, pokemon_search_index, pokemon_name_generation
+    if pokemon_name_list and pokemon_name_generation == pokedex_fetcher.data_generation():
+        return pokemon_name_list
+
+    with startup_lock:
+        if (SNAPSHOT_MODE or ARROW_DIR) and pokedex_fetcher.snapshot_thread is None:
+            pokedex_fetcher.enable_snapshot()
+        generation = pokedex_fetcher.data_generation()
+        if not pokemon_name_list or pokemon_name_generation != generation:
+            catalog = pokedex_fetcher.fetch_pokemon_catalog()
+            if catalog:
+                pokemon_search_index = PokemonSearchIndex(catalog)
+                pokemon_name_list = [name for name, num in catalog]
+                pokemon_name_generation = generation
+    return pokemon_name_list
 
-def create_evolution_flow_elements(data_fetcher, current_name):
-    chain = data_fetcher.fetch_evolution_chain(current_name)
+def search_pokemon(query, limit=SEARCH_RESULTS):
+    pokemon_names()
+    return pokemon_search_index.search(query, limit)
+
+def default_pokemon():
+    names = pokemon_names()
+    return 'Pikachu' if 'Pikachu' in names else (names[0] if names else None)
+
+def create_evolution_flow_elements(data_fetcher, current_name, chain=None):
+    if chain is None:
+        chain = data_fetcher.fetch_evolution_chain(current_name)
     elements = []
     
     def evo_box(item):
@@ -213,6 +1457,52 @@ def create_evolution_flow_elements(data_fetcher, current_name):
 
 
 app = Dash(__name__, suppress_callback_exceptions=True)
+server = app.server
+
+@server.route('/health')
+def health():
+    status = pokedex_fetcher.health()
+    return jsonify(status), 200 if status['status'] == 'ok' else 503
+
+@server.route('/metrics')
+def metrics():
+    return Response(pokedex_fetcher.prometheus_metrics(), mimetype='text/plain; version=0.0.4')
+
+if TRACING:
+    @server.route('/debug/traces')
+    def debug_traces():
+        return jsonify(tracer.recent())
+
+    @server.route('/debug/traces/collapsed')
+    def debug_traces_collapsed():
+        return Response(tracer.collapsed(), mimetype='text/plain')
+
+def traced(callback):
+    # Wraps a callback run in a trace. Dash serializes the outputs after the callback
+    # returns, so with tracing on they are serialized once more in a span to time it.
+    @wraps(callback)
+    def wrapper(*args):
+        if not tracer.enabled:
+            return callback(*args)
+        with tracer.trace(callback.__name__, args=args):
+            outputs = callback(*args)
+            with tracer.span("serialize"):
+                to_json_plotly(outputs)
+        return outputs
+    return wrapper
+
+def count_queries(callback):
+    # Records how many database queries one run of a callback sends.
+    @wraps(callback)
+    def wrapper(*args):
+        queries = []
+        token = callback_queries.set(queries)
+        try:
+            return callback(*args)
+        finally:
+            callback_queries.reset(token)
+            pokedex_fetcher.query_metrics.record_callback(callback.__name__, len(queries))
+    return wrapper
 
 POKEDEX_COLORS = {
     'background': '#25292E', 
@@ -231,111 +1521,122 @@ TYPE_COLORS = {
     'DRAGON': '#7038F8', 'DARK': '#705848', 'FAIRY': '#EE99AC'
 }
 
-app.layout = html.Div(
-    children=[
-        html.Div([
-            html.H1("Pokédex Database Visualization", style={'textAlign': 'center', 'margin': '10px 0', 'color': POKEDEX_COLORS['card_bg']}),
-            dcc.Dropdown(
-                id='pokemon-dropdown',
-                options=[{'label': name, 'value': name} for name in ALL_POKEMON_NAMES],
-                value=DEFAULT_POKEMON,
-                placeholder="Search for a Pokémon...",
-                style={'width': '50%', 'margin': '0 auto', 'color': POKEDEX_COLORS['text']}
-            ),
-        ], style={'textAlign': 'center', 'padding': '15px', 'backgroundColor': POKEDEX_COLORS['header'], 'border': f'3px solid {POKEDEX_COLORS["kpi_accent"]}', 'marginBottom': '20px'}),
-
-        html.Div([
+def serve_layout():
+    # Dash calls this for every page load, so nothing is queried at import. The dropdown
+    # starts with the first few names; the rest are found by search_dropdown.
+    default = default_pokemon()
+    names = search_pokemon('')
+    if default and default not in names:
+        names = [default] + names
+    return html.Div(
+        children=[
             html.Div([
-                html.H3("Profile", className='section-title'),
-                html.Img(id='pokemon-image', style={'width': '100%', 'height': 'auto', 'maxWidth': '200px', 'margin': '0 auto', 'paddingTop': '10px'}),
-                html.P(id='pokemon-name-num', style={'textAlign': 'center', 'fontSize': '1.2em', 'fontWeight': 'bold', 'paddingTop': '10px'})
-            ], className='card', style={'width': '25%', 'height': '380px', 'textAlign': 'center'}),
+                html.H1("Pokédex Database Visualization", style={'textAlign': 'center', 'margin': '10px 0', 'color': POKEDEX_COLORS['card_bg']}),
+                dcc.Dropdown(
+                    id='pokemon-dropdown',
+                    options=[search_option(name) for name in names],
+                    value=default,
+                    placeholder="Search for a Pokémon...",
+                    style={'width': '50%', 'margin': '0 auto', 'color': POKEDEX_COLORS['text']}
+                ),
+                dcc.Store(id='pokemon-search-query'),
+            ], style={'textAlign': 'center', 'padding': '15px', 'backgroundColor': POKEDEX_COLORS['header'], 'border': f'3px solid {POKEDEX_COLORS["kpi_accent"]}', 'marginBottom': '20px'}),
 
             html.Div([
-                html.H3("Key Stats (KPIs)", className='section-title'),
-                html.Div(id='kpi-container', className='kpi-grid')
-            ], className='card', style={'width': '25%', 'height': '380px'}),
+                html.Div([
+                    html.H3("Profile", className='section-title'),
+                    html.Img(id='pokemon-image', style={'width': '100%', 'height': 'auto', 'maxWidth': '200px', 'margin': '0 auto', 'paddingTop': '10px'}),
+                    html.P(id='pokemon-name-num', style={'textAlign': 'center', 'fontSize': '1.2em', 'fontWeight': 'bold', 'paddingTop': '10px'})
+                ], className='card', style={'width': '25%', 'height': '380px', 'textAlign': 'center'}),
+
+                html.Div([
+                    html.H3("Key Stats (KPIs)", className='section-title'),
+                    html.Div(id='kpi-container', className='kpi-grid')
+                ], className='card', style={'width': '25%', 'height': '380px'}),
             
-            html.Div([
-                html.H3("Type Composition", className='section-title'),
-                dcc.Graph(id='type-pie-chart', config={'displayModeBar': False})
-            ], className='card', style={'width': '45%', 'height': '380px'}),
+                html.Div([
+                    html.H3("Type Composition", className='section-title'),
+                    dcc.Graph(id='type-pie-chart', config={'displayModeBar': False})
+                ], className='card', style={'width': '45%', 'height': '380px'}),
 
-        ], className='row-container'),
+            ], className='row-container'),
 
-        html.Div([
             html.Div([
-                html.H3("Type Distribution", className='section-title'),
-                dcc.Graph(id='weakness-bar-chart', config={'displayModeBar': False})
-            ], className='card', style={'width': '45%'}),
+                html.Div([
+                    html.H3("Type Distribution", className='section-title'),
+                    dcc.Graph(id='weakness-bar-chart', config={'displayModeBar': False})
+                ], className='card', style={'width': '45%'}),
             
-            html.Div([
-                html.H3("Evolution Path", className='section-title'),
-                html.Div(id='evolution-flow-container') 
-            ], className='card', style={'width': '55%', 'minHeight': '350px', 'align-items': 'center'}),
+                html.Div([
+                    html.H3("Evolution Path", className='section-title'),
+                    html.Div(id='evolution-flow-container') 
+                ], className='card', style={'width': '55%', 'minHeight': '350px', 'align-items': 'center'}),
             
-        ], className='row-container'),
-
-    ], 
-    style={
-        'maxWidth': '1200px', 
-        'margin': '0 auto', 
-        'fontFamily': 'sans-serif', 
-        'backgroundColor': POKEDEX_COLORS['background'], 
-        'padding': '0',
-        '--card-background': POKEDEX_COLORS['card_bg'],
-        '--kpi-color': POKEDEX_COLORS['kpi_accent'],
-        '--header-color': POKEDEX_COLORS['header']
-    }, 
-    className='pokedex-dashboard-layout'
-)
+            ], className='row-container'),
 
-@app.callback(
-    [
-        Output('pokemon-image', 'src'),
-        Output('pokemon-name-num', 'children'),
-        Output('kpi-container', 'children'),
-        Output('type-pie-chart', 'figure'),
-        Output('weakness-bar-chart', 'figure'),
-        Output('evolution-flow-container', 'children')
-    ],
-    [Input('pokemon-dropdown', 'value')]
-)
-def update_dashboard(selected_name):
-    if not selected_name or not ALL_POKEMON_NAMES:
-        return (
-            "https://via.placeholder.com/200?text=Select+Pokemon", 
-            "Select a Pokémon", 
-            [html.P("N/A")]*4, go.Figure(), go.Figure(), html.Div("N/A")
-        )
-        
-    data = pokedex_fetcher.fetch_pokemon_data(selected_name)
-    
-    if not data:
-        return (
-            "https://via.placeholder.com/200?text=Error", 
-            f"Error: {selected_name} not found or data missing.", 
-            [html.P("Data Error")]*4, go.Figure(), go.Figure(), html.Div("Error")
-        )
+            html.Div([
+                html.Div([
+                    html.H3("Matchups", className='section-title'),
+                    html.Div(id='matchup-container', className='matchup-grid')
+                ], className='card', style={'width': '50%'}),
 
-    def kpi_box(label, value, unit):
-        value_str = str(value)
-        unit_str = unit if value_str not in ('N/A', '0', '0.0') else ''
-        return html.Div([
-            html.Div(label, className='kpi-label'),
-            html.Div(f"{value_str} {unit_str}", className='kpi-value')
-        ], className='kpi-box')
+                html.Div([
+                    html.H3("Team Coverage", className='section-title'),
+                    dcc.Dropdown(
+                        id='team-dropdown',
+                        options=[search_option(name) for name in names],
+                        value=[],
+                        multi=True,
+                        placeholder=f"Pick up to {TEAM_SIZE} Pokémon...",
+                        style={'color': POKEDEX_COLORS['text']}
+                    ),
+                    dcc.Store(id='team-search-query'),
+                    html.Div(id='team-coverage-container')
+                ], className='card', style={'width': '50%'}),
+
+            ], className='row-container'),
+
+        ] + (build_highlight_stores() if CLIENTSIDE_HIGHLIGHT else []), 
+        style={
+            'maxWidth': '1200px', 
+            'margin': '0 auto', 
+            'fontFamily': 'sans-serif', 
+            'backgroundColor': POKEDEX_COLORS['background'], 
+            'padding': '0',
+            '--card-background': POKEDEX_COLORS['card_bg'],
+            '--kpi-color': POKEDEX_COLORS['kpi_accent'],
+            '--header-color': POKEDEX_COLORS['header']
+        }, 
+        className='pokedex-dashboard-layout'
+    )
+
+app.layout = serve_layout
+
+def figure_json(fig):
+    # Plain JSON-compatible dict: Dash serializes it directly instead of re-validating and
+    # encoding a Figure object on every response.
+    return json.loads(fig.to_json())
+
+def kpi_box(label, value, unit):
+    value_str = str(value)
+    unit_str = unit if value_str not in ('N/A', '0', '0.0') else ''
+    return html.Div([
+        html.Div(label, className='kpi-label'),
+        html.Div(f"{value_str} {unit_str}", className='kpi-value')
+    ], className='kpi-box')
+
+def get_bar_colors(type_name, weaknesses_list):
+    if type_name in weaknesses_list:
+        return TYPE_COLORS.get(type_name.upper(), POKEDEX_COLORS['header']) 
+    return '#BBBBBB' 
+
+def build_pie_figure(types):
+    # Imported on first use; plotly.express is the slowest import of the module.
+    import plotly.express as px
 
-    kpis = [
-        kpi_box("HEIGHT", data['height'], "m"),
-        kpi_box("WEIGHT", data['weight'], "kg"),
-        kpi_box("EGG DISTANCE", data['egg_distance'], "km"),
-        kpi_box("CANDY COUNT", data['candy_count'], "units")
-    ]
-    
     types_df = pd.DataFrame({
-        'Type': data['types'], 
-        'Proportion': [100/len(data['types'])] * len(data['types'])
+        'Type': types, 
+        'Proportion': [100/len(types)] * len(types)
     })
     
     pie_fig = px.pie(
@@ -344,7 +1645,7 @@ def update_dashboard(selected_name):
         names='Type', 
         hole=.5, 
         color='Type',
-        color_discrete_map={t: TYPE_COLORS.get(t.upper(), '#6C7A89') for t in data['types']}
+        color_discrete_map={t: TYPE_COLORS.get(t.upper(), '#6C7A89') for t in types}
     )
 
     pie_fig.update_layout(
@@ -355,21 +1656,16 @@ def update_dashboard(selected_name):
         uniformtext_minsize=12, 
         uniformtext_mode='hide'
     )
-    
-    type_counts_df = data['weakness_counts_df'] 
-    
-    def get_bar_colors(type_name, weaknesses_list):
-        if type_name in weaknesses_list:
-            return TYPE_COLORS.get(type_name.upper(), POKEDEX_COLORS['header']) 
-        return '#BBBBBB' 
+    return figure_json(pie_fig)
 
-    colors = [get_bar_colors(t, data['weaknesses']) for t in type_counts_df['type_name']]
-    
+@lru_cache(maxsize=8)
+def build_bar_base(type_names, type_counts):
+    # The bars only change when the data does; each selection just recolors a copy.
     bar_fig = go.Figure(data=[
         go.Bar(
-            x=type_counts_df['type_name'], 
-            y=type_counts_df['type_count'], 
-            marker_color=colors,
+            x=list(type_names), 
+            y=list(type_counts), 
+            marker_color=['#BBBBBB'] * len(type_names),
             name="Type Count"
         )
     ])
@@ -384,8 +1680,31 @@ def update_dashboard(selected_name):
         height=300,
         xaxis={'categoryorder':'total descending', 'tickangle': -45}
     )
+    return figure_json(bar_fig)
+
+def build_bar_figure(type_names, type_counts, weaknesses):
+    base = build_bar_base(tuple(type_names), tuple(type_counts))
+    colors = [get_bar_colors(t, weaknesses) for t in type_names]
+    trace = dict(base['data'][0], marker=dict(base['data'][0]['marker'], color=colors))
+    return dict(base, data=[trace])
+
+def render_figures(types, weaknesses, type_names, type_counts):
+    # Takes plain lists so it can run in a worker process when pre-rendering.
+    pie_fig = tracer.call("pie", build_pie_figure, types)
+    if CLIENTSIDE_HIGHLIGHT:
+        return pie_fig, None
+    return pie_fig, tracer.call("bar", build_bar_figure, type_names, type_counts, weaknesses)
+
+def assemble_outputs(selected_name, data, chain, pie_fig, bar_fig):
+    kpis = [
+        kpi_box("HEIGHT", data['height'], "m"),
+        kpi_box("WEIGHT", data['weight'], "kg"),
+        kpi_box("EGG DISTANCE", data['egg_distance'], "km"),
+        kpi_box("CANDY COUNT", data['candy_count'], "units")
+    ]
     
-    evolution_flow_elements = create_evolution_flow_elements(pokedex_fetcher, selected_name)
+    with tracer.span("evolution_flow"):
+        evolution_flow_elements = create_evolution_flow_elements(pokedex_fetcher, selected_name, chain)
 
     return (
         data['img_url'],
@@ -396,6 +1715,385 @@ def update_dashboard(selected_name):
         evolution_flow_elements
     )
 
+def figure_args(data):
+    type_counts_df = data['weakness_counts_df'] 
+    return (
+        data['types'], data['weaknesses'],
+        type_counts_df['type_name'].tolist(), [int(c) for c in type_counts_df['type_count']]
+    )
+
+def render_dashboard(selected_name):
+    with tracer.span("fetch"):
+        data, chain = pokedex_fetcher.fetch_dashboard_data(selected_name)
+
+    if not data:
+        return None
+
+    with tracer.span("figures"):
+        pie_fig, bar_fig = render_figures(*figure_args(data))
+    return assemble_outputs(selected_name, data, chain, pie_fig, bar_fig)
+
+def prerender_dashboard(names, workers=None):
+    # Fills the render cache for every Pokemon, building the Plotly figures across a
+    # process pool. Data is fetched here so the workers never touch the database.
+    start = time.perf_counter()
+    generation = pokedex_fetcher.data_generation()
+    fetched = {name: pokedex_fetcher.fetch_dashboard_data(name) for name in names}
+    fetched = {name: result for name, result in fetched.items() if result[0]}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(render_figures, *figure_args(data)) for name, (data, chain) in fetched.items()}
+        for name, future in futures.items():
+            data, chain = fetched[name]
+            pie_fig, bar_fig = future.result()
+            render_cache.put((name, generation), assemble_outputs(name, data, chain, pie_fig, bar_fig))
+
+    print(f"Pre-rendered {len(fetched)} Pokemon in {time.perf_counter() - start:.2f}s.")
+
+render_cache = QueryCache(max_size=FIGURE_CACHE_SIZE, ttl=float('inf'))
+
+def preload():
+    # Startup work kept out of the import. Run before the server forks its workers, which
+    # then inherit the loaded state copy-on-write (see wsgi.py); without it the same work
+    # happens lazily on the first request.
+    names = pokemon_names()
+    pokedex_fetcher.fetch_type_matrix()
+    if PRERENDER_FIGURES:
+        prerender_dashboard(names)
+
+def search_option(name, query=''):
+    # The dropdown filters the options it receives against the typed text once more. The
+    # query is added to each option's search text, so server matches that the browser's
+    # plain word matching would reject ("pikchu", "nidoran f") stay visible.
+    return {'label': name, 'value': name, 'search': f"{name} {query}".strip()}
+
+# Holds each keystroke for SEARCH_DEBOUNCE_MS and only passes on the last one, so a burst
+# of typing costs one server search.
+SEARCH_DEBOUNCE_JS = """
+function(searchValue) {
+    var state = window.pokedexSearch = window.pokedexSearch || {latest: 0};
+    var request = ++state.latest;
+    return new Promise(function(resolve) {
+        setTimeout(function() {
+            resolve(request === state.latest ? searchValue : window.dash_clientside.no_update);
+        }, %d);
+    });
+}
+""" % SEARCH_DEBOUNCE_MS
+
+app.clientside_callback(
+    SEARCH_DEBOUNCE_JS,
+    Output('pokemon-search-query', 'data'),
+    Input('pokemon-dropdown', 'search_value'),
+    prevent_initial_call=True
+)
+
+@app.callback(
+    Output('pokemon-dropdown', 'options'),
+    Input('pokemon-search-query', 'data'),
+    State('pokemon-dropdown', 'value'),
+    prevent_initial_call=True
+)
+@count_queries
+@traced
+def search_dropdown(query, selected_name):
+    if not query:
+        raise PreventUpdate
+
+    options = [search_option(name, query) for name in search_pokemon(query)]
+    # The selected Pokemon must stay among the options or the dropdown clears it.
+    if selected_name and all(option['value'] != selected_name for option in options):
+        options.append(search_option(selected_name))
+    return options
+
+def benchmark_search(size=10000, repeats=3):
+    # Search latency per keystroke over a synthetic catalog of at least `size` names,
+    # built by repeating the loaded names with form suffixes and new numbers.
+    import random
+
+    base = pokemon_names() or ['Bulbasaur', 'Nidoran ♀ (Female)', 'Mr. Mime', "Farfetch'd", 'Pikachu']
+    forms = ['', ' (Alolan)', ' (Galarian)', ' (Shiny)', ' (Mega)', ' ♂', ' ♀']
+    catalog = [
+        (f"{name}{forms[(i // len(base)) % len(forms)]}{'' if i < len(base) * len(forms) else f' {i}'}", f"{i + 1:03d}")
+        for i, name in enumerate(base * (size // len(base) + 1))
+    ][:size]
+
+    start = time.perf_counter()
+    index = PokemonSearchIndex(catalog)
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(0)
+    queries = [name for name, num in rng.sample(catalog, 50)] + ['nidoran f', 'mr mime', 'pikchu', 'chu', '#25', '7']
+    keystrokes = [query[:i] for query in queries for i in range(1, len(query) + 1)]
+
+    timings = []
+    for _ in range(repeats):
+        for query in keystrokes:
+            start = time.perf_counter()
+            index.search(query, SEARCH_RESULTS)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    print(f"Indexed {len(catalog)} names in {build_seconds * 1000:.1f} ms")
+    print(f"{len(timings)} searches: mean {sum(timings) / len(timings) * 1000:.3f} ms  "
+          f"p50 {timings[len(timings) // 2] * 1000:.3f} ms  p95 {timings[int(len(timings) * 0.95)] * 1000:.3f} ms  "
+          f"max {timings[-1] * 1000:.3f} ms")
+
+def check_team_coverage(matrix, teams):
+    # Recounts each suggestion's new_hits directly: the Pokemon no team member's type hits
+    # that are weak to at least one of the suggestion's types.
+    for team in teams:
+        coverage = matrix.team_coverage(team, MATCHUP_RESULTS)
+        team_types = {t for name in team for t in matrix.type_list(matrix.has_type, matrix.positions[name])}
+        weaknesses = [set(matrix.type_list(matrix.weak, i)) for i in range(len(matrix.names))]
+        uncovered = [w for w in weaknesses if not w & team_types]
+        for suggestion in coverage['suggestions']:
+            expected = sum(1 for w in uncovered if w & set(suggestion['types']))
+            if suggestion['new_hits'] != expected:
+                raise AssertionError(f"{suggestion['name']} for team {team}: new_hits {suggestion['new_hits']}, expected {expected}")
+
+def benchmark_matchups(size=100000, repeats=20):
+    # Matchup query latency over a synthetic catalog of `size` Pokemon whose type and
+    # weakness sets are drawn from the loaded ones (random ones without a database).
+    import random
+
+    rng = random.Random(0)
+    matrix = pokedex_fetcher.fetch_type_matrix()
+    if matrix is not None and matrix.names:
+        base = [(matrix.type_list(matrix.has_type, i), matrix.type_list(matrix.weak, i)) for i in range(len(matrix.names))]
+    else:
+        type_names = [t.title() for t in TYPE_COLORS]
+        base = [(rng.sample(type_names, rng.randint(1, 2)), rng.sample(type_names, rng.randint(1, 5))) for _ in range(151)]
+    sets = [rng.choice(base) for _ in range(size)]
+
+    start = time.perf_counter()
+    matrix = TypeMatrix([f"Pokemon {i}" for i in range(size)], [t for t, w in sets], [w for t, w in sets])
+    build_seconds = time.perf_counter() - start
+
+    queries = {
+        "counter_picks": lambda names: matrix.counter_picks(names[:1], MATCHUP_RESULTS),
+        "team_coverage": lambda names: matrix.team_coverage(names, MATCHUP_RESULTS),
+        "similar": lambda names: matrix.similar(names[0], MATCHUP_RESULTS)
+    }
+
+    print(f"Built {size} x {len(matrix.type_names)} type matrix in {build_seconds * 1000:.1f} ms")
+    check_team_coverage(matrix, [rng.sample(matrix.names, TEAM_SIZE) for _ in range(3)])
+    for label, query in queries.items():
+        timings = []
+        for _ in range(repeats):
+            names = rng.sample(matrix.names, TEAM_SIZE)
+            start = time.perf_counter()
+            query(names)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"{label:<14} p50 {timings[len(timings) // 2] * 1000:.2f} ms  max {timings[-1] * 1000:.2f} ms")
+
+def measure_startup():
+    # Times a bare import in a fresh interpreter, then the deferred startup work in this
+    # process. Only the import counts against IMPORT_TIME_BUDGET: it is what every worker,
+    # script and test pays, database or not.
+    import subprocess
+
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import importlib; importlib.import_module('milestone3-pokedex-dashboard')"],
+        cwd=module_dir, check=True
+    )
+    import_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    preload()
+    preload_seconds = time.perf_counter() - start
+
+    print(f"Import:  {import_seconds:.2f}s (budget {IMPORT_TIME_BUDGET:.2f}s)")
+    print(f"Preload: {preload_seconds:.2f}s ({len(pokemon_names())} Pokemon)")
+    return import_seconds <= IMPORT_TIME_BUDGET
+
+def build_highlight_stores():
+    # Client-side highlighting ships the uncolored bar figure, each bar's highlight color
+    # and every Pokemon's weaknesses as bar positions once, with the page.
+    type_counts_df = pokedex_fetcher.fetch_type_counts()
+    type_names = type_counts_df['type_name'].tolist() if not type_counts_df.empty else []
+    type_counts = [int(c) for c in type_counts_df['type_count']] if not type_counts_df.empty else []
+    positions = {type_name: i for i, type_name in enumerate(type_names)}
+
+    weakness_map = {
+        name: [positions[w] for w in weaknesses if w in positions]
+        for name, weaknesses in pokedex_fetcher.fetch_weakness_map().items()
+    }
+
+    return [
+        dcc.Store(id='bar-base-store', data={
+            'figure': build_bar_base(tuple(type_names), tuple(type_counts)),
+            'highlight': [get_bar_colors(t, [t]) for t in type_names]
+        }),
+        dcc.Store(id='weakness-map-store', data=weakness_map)
+    ]
+
+# Recolors a copy of the stored base figure in the browser; the server never sees these
+# selections.
+HIGHLIGHT_JS = """
+function(selectedName, barBase, weaknessMap) {
+    if (!barBase) {
+        return window.dash_clientside.no_update;
+    }
+    var colors = barBase.highlight.map(function() { return '#BBBBBB'; });
+    ((weaknessMap && weaknessMap[selectedName]) || []).forEach(function(i) {
+        colors[i] = barBase.highlight[i];
+    });
+    var trace = Object.assign({}, barBase.figure.data[0], {
+        marker: Object.assign({}, barBase.figure.data[0].marker, {color: colors})
+    });
+    return Object.assign({}, barBase.figure, {data: [trace]});
+}
+"""
+
+if CLIENTSIDE_HIGHLIGHT:
+    app.clientside_callback(
+        HIGHLIGHT_JS,
+        Output('weakness-bar-chart', 'figure'),
+        Input('pokemon-dropdown', 'value'),
+        State('bar-base-store', 'data'),
+        State('weakness-map-store', 'data')
+    )
+
+def callback_outputs(outputs):
+    # With client-side highlighting the bar chart is not a server output.
+    if CLIENTSIDE_HIGHLIGHT:
+        return outputs[:4] + outputs[5:]
+    return outputs
+
+@app.callback(
+    [
+        Output('pokemon-image', 'src'),
+        Output('pokemon-name-num', 'children'),
+        Output('kpi-container', 'children'),
+        Output('type-pie-chart', 'figure')
+    ] + ([] if CLIENTSIDE_HIGHLIGHT else [Output('weakness-bar-chart', 'figure')]) + [
+        Output('evolution-flow-container', 'children')
+    ],
+    [Input('pokemon-dropdown', 'value')]
+)
+@count_queries
+@traced
+def update_dashboard(selected_name):
+    if not selected_name or not pokemon_names():
+        return callback_outputs((
+            "https://via.placeholder.com/200?text=Select+Pokemon", 
+            "Select a Pokémon", 
+            [html.P("N/A")]*4, go.Figure(), go.Figure(), html.Div("N/A")
+        ))
+
+    # Rendered outputs are memoized per Pokemon and load generation, so a new load
+    # never serves figures built from the previous data.
+    key = (selected_name, pokedex_fetcher.data_generation())
+    outputs = render_cache.get(key)
+
+    if outputs is None:
+        outputs = render_dashboard(selected_name)
+
+        if outputs is None:
+            return callback_outputs((
+                "https://via.placeholder.com/200?text=Error", 
+                f"Error: {selected_name} not found or data missing.", 
+                [html.P("Data Error")]*4, go.Figure(), go.Figure(), html.Div("Error")
+            ))
+
+        render_cache.put(key, outputs)
+
+    return callback_outputs(outputs)
+
+def type_badges(types):
+    return [
+        html.Span(t, className='type-badge', style={'backgroundColor': TYPE_COLORS.get(t.upper(), '#6C7A89')})
+        for t in types
+    ]
+
+def matchup_list(label, rows, detail):
+    items = [
+        html.Li([html.Span(row['name'], className='matchup-name')] + type_badges(row['types']) + [
+            html.Span(detail(row), className='matchup-detail')
+        ])
+        for row in rows
+    ]
+    return html.Div([
+        html.Div(label, className='kpi-label'),
+        html.Ol(items, className='matchup-list') if items else html.P("N/A")
+    ])
+
+@app.callback(
+    Output('matchup-container', 'children'),
+    Input('pokemon-dropdown', 'value')
+)
+@count_queries
+@traced
+def update_matchups(selected_name):
+    if not selected_name:
+        return html.P("N/A")
+
+    counters = pokedex_fetcher.fetch_counter_picks([selected_name], MATCHUP_RESULTS)
+    similar = pokedex_fetcher.fetch_similar_pokemon(selected_name, MATCHUP_RESULTS)
+    return [
+        matchup_list("COUNTER PICKS", counters, lambda row: f"{row['score']:+d}"),
+        matchup_list("MOST SIMILAR", similar, lambda row: f"{row['similarity']:.0%}")
+    ]
+
+app.clientside_callback(
+    SEARCH_DEBOUNCE_JS,
+    Output('team-search-query', 'data'),
+    Input('team-dropdown', 'search_value'),
+    prevent_initial_call=True
+)
+
+@app.callback(
+    Output('team-dropdown', 'options'),
+    Input('team-search-query', 'data'),
+    State('team-dropdown', 'value'),
+    prevent_initial_call=True
+)
+@count_queries
+@traced
+def search_team_dropdown(query, team):
+    if not query:
+        raise PreventUpdate
+
+    options = [search_option(name, query) for name in search_pokemon(query)]
+    # Team members must stay among the options or the dropdown drops them.
+    found = {option['value'] for option in options}
+    options.extend(search_option(name) for name in team or [] if name not in found)
+    return options
+
+@app.callback(
+    Output('team-coverage-container', 'children'),
+    Input('team-dropdown', 'value')
+)
+@count_queries
+@traced
+def update_team_coverage(team):
+    team = (team or [])[:TEAM_SIZE]
+    if not team:
+        return html.P("Pick Pokémon to see which types threaten the team.", className='matchup-detail')
+
+    coverage = pokedex_fetcher.fetch_team_coverage(team, MATCHUP_RESULTS)
+    if coverage is None:
+        return html.P("Data Error")
+
+    weak_counts = sorted(coverage['weak_counts'].items(), key=lambda item: (-item[1], item[0]))
+    return [
+        html.Div([
+            kpi_box("CATALOG HIT", round(coverage['coverage'] * 100), "%"),
+            kpi_box("SHARED WEAKNESSES", len(coverage['shared_weaknesses']), "types")
+        ], className='kpi-grid matchup-kpis'),
+        html.Div("WEAK TO (MEMBERS)", className='kpi-label'),
+        html.Div([
+            html.Span([badge, html.Span(f"×{count}", className='matchup-detail')])
+            for (type_name, count), badge in zip(weak_counts, type_badges([t for t, count in weak_counts]))
+        ] or html.P("N/A")),
+        matchup_list("SUGGESTED ADDITIONS", coverage['suggestions'],
+                     lambda row: f"{row['stacked']} stacked, +{row['new_hits']} hits")
+    ]
+
 app.index_string = ''' 
 <!DOCTYPE html>
 <html>
@@ -495,6 +2193,21 @@ app.index_string = '''
                 position: absolute;
                 line-height: 1; 
             }
+            .matchup-grid { display: grid; grid-template-columns: 1fr 1fr; gap: 10px; }
+            .matchup-kpis { height: auto; margin: 10px 0; }
+            .matchup-list { padding-left: 20px; margin: 5px 0 10px 0; }
+            .matchup-list li { margin-bottom: 4px; }
+            .matchup-name { font-weight: bold; margin-right: 4px; }
+            .matchup-detail { font-size: 0.8em; color: #555; margin-left: 4px; }
+            .type-badge {
+                display: inline-block;
+                color: #FFFFFF;
+                font-size: 0.7em;
+                font-weight: bold;
+                padding: 1px 6px;
+                margin-right: 2px;
+                border-radius: 3px;
+            }
             .evo-name { font-weight: bold; font-size: 0.9em; line-height: 1.2; }
             .evo-num { font-size: 0.7em; color: #555; }
             
@@ -527,6 +2240,27 @@ app.index_string = '''
 '''
 
 if __name__ == '__main__':
+    if '--check-plans' in sys.argv:
+        pokedex_fetcher.check_query_plans(default_pokemon())
+        sys.exit(0)
+
+    if '--measure-startup' in sys.argv:
+        sys.exit(0 if measure_startup() else 1)
+
+    if '--benchmark-search' in sys.argv:
+        benchmark_search()
+        sys.exit(0)
+
+    if '--benchmark-matchups' in sys.argv:
+        benchmark_matchups()
+        sys.exit(0)
+
+    if '--compare-latency' in sys.argv:
+        pokedex_fetcher.compare_fetch_latency(pokemon_names()[:20])
+        sys.exit(0)
+
+    preload()
+
     print("\nRunning Dash application...")
     print("Access the dashboard at: http://127.0.0.1:8050/")
     
@@ -0,0 +1,357 @@
+import io
+import os
+import re
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import platform
+import tempfile
+import importlib
+import contextlib
+
+# Reproducible benchmarks for the loader and the dashboard's hot paths. Synthetic datasets
+# are built by repeating data/pokedex.json; each scale is loaded into a fresh database and
+# then queried through the real PokedexDataFetcher and update_dashboard. The default
+# backend is a local SQLite file reached through the loader's own MySQL statements, so no
+# server is needed; --backend mysql runs the same against a local MySQL/MariaDB.
+
+loader = importlib.import_module("milestone2-pokedex-database")
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "pokedex.json")
+BENCH_DB_NAME = "pokedex_bench"
+TABLES = ["Candy", "Egg", "Pokemon", "Type", "PokemonType", "Weakness", "PokemonWeakness", "Evolution"]
+
+def synthetic_pokedex(records, scale):
+    # Copy 0 is the real data. Later copies get their own names and numbers, with the
+    # evolution links pointing inside the same copy. Their numbers are five hex digits,
+    # which fit Pokemon.num VARCHAR(5) for up to a million records and never collide with
+    # the real three-digit numbers.
+    size = len(records)
+    dataset = []
+    for copy in range(scale):
+        if copy == 0:
+            nums = {p["num"]: p["num"] for p in records}
+        else:
+            nums = {p["num"]: f"{copy * size + i + 1:05X}" for i, p in enumerate(records)}
+
+        for p in records:
+            clone = dict(p, num=nums[p["num"]], name=p["name"] if copy == 0 else f"{p['name']} {copy}")
+            for key in ("next_evolution", "prev_evolution"):
+                if key in p:
+                    clone[key] = [
+                        {"num": nums.get(evo["num"], evo["num"]), "name": evo["name"] if copy == 0 else f"{evo['name']} {copy}"}
+                        for evo in p[key]
+                    ]
+            dataset.append(clone)
+    return dataset
+
+class SQLiteCursor:
+    # Runs the loader's MySQL statements on SQLite by rewriting the few dialect
+    # differences it uses; everything else is passed through unchanged.
+    REWRITES = [
+        (re.compile(r"CREATE DATABASE .*|USE \w+;?"), ""),
+        (re.compile(r"INT AUTO_INCREMENT"), "INTEGER"),
+        (re.compile(r",\s*KEY \w+ \([^)]*\)"), ""),
+        (re.compile(r"START TRANSACTION"), "BEGIN"),
+        (re.compile(r"LAST_INSERT_ID\(\)"), "last_insert_rowid()"),
+        (re.compile(r"GROUP_CONCAT\((.*?) ORDER BY [^)]*? SEPARATOR (',')\)"), r"group_concat(\1, \2)"),
+        (re.compile(r"ON DUPLICATE KEY UPDATE"), "ON CONFLICT DO UPDATE SET"),
+        (re.compile(r"VALUES\((\w+)\)"), r"excluded.\1"),
+        (re.compile(r"%s"), "?")
+    ]
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.cursor = connection.cursor()
+
+    def translate(self, sql):
+        for pattern, replacement in self.REWRITES:
+            sql = pattern.sub(replacement, sql)
+        return sql
+
+    def execute(self, sql, params=()):
+        sql = self.translate(sql)
+        if sql.strip():
+            self.cursor.execute(sql, params or ())
+
+    def executemany(self, sql, rows):
+        # pymysql sends a batch as one multi-row INSERT, a single autocommitted statement,
+        # where SQLite in autocommit mode would commit every row on its own.
+        if self.connection.in_transaction:
+            self.cursor.executemany(self.translate(sql), rows)
+            return
+        self.cursor.execute("BEGIN")
+        self.cursor.executemany(self.translate(sql), rows)
+        self.cursor.execute("COMMIT")
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    @property
+    def lastrowid(self):
+        return self.cursor.lastrowid
+
+    def close(self):
+        self.cursor.close()
+
+class MySQLCursor:
+    # The loader always creates and uses pokedex_db; the benchmark keeps to its own
+    # database so it never replaces real data.
+    def __init__(self, connection):
+        self.cursor = connection.cursor()
+
+    def execute(self, sql, params=None):
+        self.cursor.execute(sql.replace("pokedex_db", BENCH_DB_NAME), params)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+def open_database(backend, path):
+    if backend == "sqlite":
+        if os.path.exists(path):
+            os.remove(path)
+        connection = sqlite3.connect(path, isolation_level=None)
+        return connection, SQLiteCursor(connection), f"sqlite:///{path}"
+
+    import pymysql
+    host = os.environ.get("DB_HOST", "127.0.0.1")
+    user = os.environ.get("DB_USER", "root")
+    password = os.environ.get("DB_PASS", "")
+    connection = pymysql.connect(host=host, port=3306, user=user, password=password, autocommit=True)
+    return connection, MySQLCursor(connection), f"mysql+pymysql://{user}:{password}@{host}:3306/{BENCH_DB_NAME}"
+
+def count_rows(cur):
+    total = 0
+    for table in TABLES:
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        total += cur.fetchone()[0]
+    return total
+
+LOAD_MODES = {
+    "row": lambda cur, dataset, batch_size, chunk_size: loader.insert_data(cur, dataset),
+    "bulk": lambda cur, dataset, batch_size, chunk_size: loader.insert_data_bulk(cur, dataset, batch_size),
+    "vectorized": lambda cur, dataset, batch_size, chunk_size: loader.insert_data_bulk(cur, dataset, batch_size, vectorized=True),
+    "chunked": lambda cur, dataset, batch_size, chunk_size: loader.insert_data_chunked(cur, dataset, "benchmark", chunk_size, batch_size)
+}
+
+def benchmark_normalize(dataset):
+    # Normalization alone, without a database: the per-record builder against the pandas
+    # stage, both up to the row tuples load_rows writes. The two must agree row for row.
+    start = time.perf_counter()
+    loop_rows = loader.build_rows(dataset)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frames = loader.normalize_frames(dataset)
+    frame_seconds = time.perf_counter() - start
+    vectorized_rows = loader.frame_rows(frames)
+    vectorized_seconds = time.perf_counter() - start
+
+    mismatched = [table for table in loader.TABLE_LOAD_ORDER if loop_rows[table] != vectorized_rows[table]]
+    if mismatched:
+        raise AssertionError("Vectorized normalization differs in " + ", ".join(mismatched))
+
+    return {
+        "records": len(dataset),
+        "loop_seconds": loop_seconds,
+        "frames_seconds": frame_seconds,
+        "vectorized_seconds": vectorized_seconds,
+        "speedup": loop_seconds / vectorized_seconds
+    }
+
+def benchmark_load(backend, path, dataset, mode, batch_size, chunk_size=None):
+    connection, cur, url = open_database(backend, path)
+    # The loader reports progress with print; it is kept out of the benchmark output.
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader.setup_db(cur)
+        loader.migrate_db(cur)
+
+        start = time.perf_counter()
+        loaded = LOAD_MODES[mode](cur, dataset, batch_size, chunk_size)
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loader.refresh_summaries(cur)
+        summary_seconds = time.perf_counter() - start
+
+        loader.bump_generation(cur)
+    rows = count_rows(cur)
+    cur.close()
+    connection.close()
+
+    result = {
+        "records": len(dataset),
+        "rows": rows,
+        "seconds": load_seconds,
+        "records_per_sec": len(dataset) / load_seconds,
+        "rows_per_sec": rows / load_seconds,
+        "summary_seconds": summary_seconds
+    }
+    if mode == "chunked":
+        result.update(chunk_size=chunk_size, chunks=loaded["chunks"], commit_seconds=loaded["commit_seconds"],
+                      commit_share=loaded["commit_seconds"] / load_seconds)
+    return url, result
+
+def benchmark_validate(dataset):
+    # The validation stage on its own, with nothing to reject, as run in front of a load.
+    validator = loader.PokedexValidator(os.devnull)
+    start = time.perf_counter()
+    validator.validate(dataset)
+    seconds = time.perf_counter() - start
+    return {"records": len(dataset), "seconds": seconds, "records_per_sec": len(dataset) / seconds}
+
+def percentiles(timings):
+    timings = sorted(timings)
+    pick = lambda q: timings[min(len(timings) - 1, int(len(timings) * q))] * 1000
+    return {
+        "n": len(timings),
+        "mean_ms": sum(timings) / len(timings) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": timings[-1] * 1000
+    }
+
+def benchmark_dashboard(url, names):
+    os.environ["DB_URL"] = url
+    dashboard = importlib.import_module("milestone3-pokedex-dashboard")
+
+    # A fresh fetcher per database, with every cache emptied before each timed call so
+    # each sample pays for its queries.
+    fetcher = dashboard.PokedexDataFetcher()
+    dashboard.pokedex_fetcher = fetcher
+    dashboard.pokemon_name_list = []
+
+    def timed(function):
+        timings = []
+        for name in names:
+            fetcher.cache.clear()
+            dashboard.render_cache.clear()
+            start = time.perf_counter()
+            function(name)
+            timings.append(time.perf_counter() - start)
+        return percentiles(timings)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        dashboard.pokemon_names()
+        results = {
+            "fetch_pokemon_data": timed(fetcher.fetch_pokemon_data),
+            "fetch_evolution_chain": timed(fetcher.fetch_evolution_chain),
+            "update_dashboard": timed(dashboard.update_dashboard)
+        }
+    results["sql"] = fetcher.query_metrics.stats()
+    fetcher.query_pool.shutdown()
+    if fetcher.engine is not None:
+        fetcher.engine.dispose()
+    return results
+
+def compare(results, baseline, tolerance):
+    # Regressions are timings that grew by more than `tolerance` over the baseline run.
+    regressions = []
+    for scale, result in results["scales"].items():
+        previous = baseline.get("scales", {}).get(scale)
+        if not previous:
+            continue
+        checks = [(f"normalize {kind}", result["normalize"][f"{kind}_seconds"], previous.get("normalize", {}).get(f"{kind}_seconds"))
+                  for kind in ("loop", "vectorized")]
+        checks.append(("validate", result["validate"]["seconds"], previous.get("validate", {}).get("seconds")))
+        checks += [(f"load {mode}", result["load"][mode]["seconds"], previous.get("load", {}).get(mode, {}).get("seconds"))
+                   for mode in result["load"]]
+        checks += [(name, result["dashboard"][name]["p50_ms"], previous.get("dashboard", {}).get(name, {}).get("p50_ms"))
+                   for name in ("fetch_pokemon_data", "fetch_evolution_chain", "update_dashboard") if "dashboard" in result]
+        for label, current, before in checks:
+            if not before:
+                continue
+            ratio = current / before
+            flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+            print(f"{scale:>6}x {label:<24} {before:10.3f} -> {current:10.3f}  ({ratio:5.2f}x){flag}")
+            if flag:
+                regressions.append(f"{scale}x {label}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Pokedex loader and dashboard against a local database.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                        help="dataset sizes as multiples of data/pokedex.json (up to 1000)")
+    parser.add_argument("--modes", nargs="+", choices=sorted(LOAD_MODES), default=["row", "bulk", "vectorized", "chunked"])
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="records per transaction for the chunked mode; each size is a separate load")
+    parser.add_argument("--normalize-only", action="store_true",
+                        help="only compare per-record and vectorized normalization, without a database")
+    parser.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite",
+                        help="sqlite file stand-in, or a local MySQL/MariaDB from DB_HOST/DB_USER/DB_PASS")
+    parser.add_argument("--samples", type=int, default=200, help="Pokemon looked up per dashboard measurement")
+    parser.add_argument("--batch-size", type=int, default=loader.BATCH_SIZE)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before a timing counts as a regression")
+    args = parser.parse_args()
+
+    records = loader.parse_json(DATA_FILE)
+    workdir = tempfile.mkdtemp(prefix="pokedex-bench-")
+    rng = random.Random(0)
+
+    results = {
+        "meta": {
+            "backend": args.backend,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "samples": args.samples,
+            "batch_size": args.batch_size
+        },
+        "scales": {}
+    }
+
+    for scale in args.scales:
+        dataset = synthetic_pokedex(records, scale)
+        scale_results = {"normalize": benchmark_normalize(dataset)}
+        normalize = scale_results["normalize"]
+        print(f"{scale:>6}x normalize  {normalize['records']:>8} records  loop {normalize['loop_seconds']:8.3f}s  "
+              f"vectorized {normalize['vectorized_seconds']:8.3f}s  ({normalize['speedup']:5.2f}x)")
+
+        scale_results["validate"] = benchmark_validate(dataset)
+        validate = scale_results["validate"]
+        print(f"{scale:>6}x validate   {validate['records']:>8} records  {validate['seconds']:8.3f}s  "
+              f"{validate['records_per_sec']:10.0f} records/s")
+
+        if args.normalize_only:
+            results["scales"][str(scale)] = scale_results
+            continue
+
+        scale_results["load"] = {}
+        runs = [(mode, chunk_size) for mode in args.modes for chunk_size in (args.chunk_sizes if mode == "chunked" else [None])]
+        for mode, chunk_size in runs:
+            label = f"{mode}-{chunk_size}" if chunk_size else mode
+            url, load = benchmark_load(args.backend, os.path.join(workdir, f"{scale}x.db"), dataset, mode, args.batch_size, chunk_size)
+            load["validation_share"] = validate["seconds"] / (validate["seconds"] + load["seconds"])
+            scale_results["load"][label] = load
+            commits = f"  {load['chunks']:>5} commits {load['commit_share']:5.1%}" if chunk_size else ""
+            print(f"{scale:>6}x load {label:<13} {load['records']:>8} records  {load['seconds']:8.2f}s  "
+                  f"{load['records_per_sec']:10.0f} records/s  {load['rows_per_sec']:10.0f} rows/s  "
+                  f"validation {load['validation_share']:5.1%}{commits}")
+
+        names = [p["name"] for p in rng.sample(dataset, min(args.samples, len(dataset)))]
+        scale_results["dashboard"] = benchmark_dashboard(url, names)
+        for name in ("fetch_pokemon_data", "fetch_evolution_chain", "update_dashboard"):
+            timing = scale_results["dashboard"][name]
+            print(f"{scale:>6}x {name:<22} p50 {timing['p50_ms']:8.2f} ms  p95 {timing['p95_ms']:8.2f} ms  p99 {timing['p99_ms']:8.2f} ms")
+
+        results["scales"][str(scale)] = scale_results
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}.")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions: " + ", ".join(regressions))
+            sys.exit(1)
@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import subprocess
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Load test for the production server. Fires the dashboard callback for random Pokemon
+# from many client threads and reports throughput and latency. With --workers it starts
+# gunicorn once per worker count, so the runs show how throughput scales with workers.
+
+def get_json(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=60) as response:
+        return json.loads(response.read())
+
+def dashboard_callback(base_url):
+    # The server-side callback driven by the dropdown that renders the profile, as listed
+    # by Dash itself, so the payload matches whichever outputs the server was started with.
+    for dependency in get_json(base_url + "/_dash-dependencies"):
+        inputs = dependency['inputs']
+        if (dependency.get('clientside_function') is None and inputs == [{'id': 'pokemon-dropdown', 'property': 'value'}]
+                and 'kpi-container.children' in dependency['output']):
+            return dependency
+    raise RuntimeError("Dashboard callback not found.")
+
+def callback_payload(dependency, name):
+    outputs = [
+        dict(zip(('id', 'property'), output.rsplit('.', 1)))
+        for output in dependency['output'].strip('.').split('...')
+    ]
+    return {
+        'output': dependency['output'],
+        'outputs': outputs,
+        'inputs': [{'id': 'pokemon-dropdown', 'property': 'value', 'value': name}],
+        'changedPropIds': ['pokemon-dropdown.value'],
+        'state': []
+    }
+
+def read_names(filenames):
+    # The dropdown only ships the first few options and finds the rest by search, so the
+    # names come from the Pokedex files the server was loaded from.
+    names = []
+    for filename in filenames:
+        with open(filename, "r", encoding="utf-8") as f:
+            names.extend(p['name'] for p in json.load(f)['pokemon'])
+    return list(dict.fromkeys(names))
+
+def run_load(base_url, requests, concurrency, names):
+    dependency = dashboard_callback(base_url)
+    if not names:
+        raise RuntimeError("The --pokedex files have no Pokemon to request.")
+
+    def one_request(_):
+        payload = callback_payload(dependency, random.choice(names))
+        start = time.perf_counter()
+        get_json(base_url + "/_dash-update-component", payload)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one_request, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'throughput': requests / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000
+    }
+
+def wait_healthy(base_url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if get_json(base_url + "/health")['status'] == 'ok':
+                return True
+        except Exception:
+            pass
+        time.sleep(0.5)
+    return False
+
+def start_server(app, workers, threads, port):
+    env = dict(os.environ, SERVER_WORKERS=str(workers), SERVER_THREADS=str(threads), SERVER_BIND=f"127.0.0.1:{port}")
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", app],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+def print_result(label, result):
+    print(f"{label:<12} {result['throughput']:8.1f} req/s  "
+          f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test the Pokedex dashboard server.")
+    parser.add_argument("--url", default="http://127.0.0.1:8050",
+                        help="Server to test when --workers is not given")
+    parser.add_argument("--workers", type=int, nargs="*",
+                        help="Start gunicorn with each of these worker counts and test it")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per worker for started servers")
+    parser.add_argument("--app", default="wsgi:server", help="WSGI application for started servers")
+    parser.add_argument("--port", type=int, default=8051, help="Port for started servers")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--pokedex", nargs="+",
+                        default=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "pokedex.json")],
+                        help="Pokedex JSON files the server was loaded from; requests pick from their names")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    names = read_names(args.pokedex)
+    results = {}
+
+    if not args.workers:
+        results['server'] = run_load(args.url, args.requests, args.concurrency, names)
+        print_result(args.url, results['server'])
+    else:
+        base_url = f"http://127.0.0.1:{args.port}"
+        for workers in args.workers:
+            process = start_server(args.app, workers, args.threads, args.port)
+            try:
+                if not wait_healthy(base_url, timeout=120):
+                    raise RuntimeError(f"Server with {workers} workers did not become healthy.")
+                # One untimed pass so every worker has warm caches before measuring.
+                run_load(base_url, args.concurrency * workers, args.concurrency, names)
+                results[workers] = run_load(base_url, args.requests, args.concurrency, names)
+                print_result(f"{workers} workers", results[workers])
+            finally:
+                process.terminate()
+                process.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
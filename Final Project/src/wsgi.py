@@ -0,0 +1,18 @@
+import gc
+import importlib
+
+# Production entry point for a multi-process WSGI server:
+#
+#     gunicorn -c gunicorn.conf.py wsgi:server
+#
+# gunicorn.conf.py preloads this module in the master process, so the name list, the
+# snapshot and any pre-rendered figures are built once and shared copy-on-write by the
+# forked workers instead of being rebuilt in every one of them.
+dashboard = importlib.import_module("milestone3-pokedex-dashboard")
+dashboard.preload()
+
+# Objects that exist now are moved out of the garbage collector's view, so collections in
+# the workers do not write to (and thereby copy) the pages they live on.
+gc.freeze()
+
+server = dashboard.server